@@ -0,0 +1,202 @@
+"""Rule-based cost analysis shared by the Flask and http.server backends."""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+# First number (including decimals) in an estimated_savings string
+_SAVINGS_NUMBER_RE = re.compile(r'\d+\.?\d*')
+
+# Last analysis: (jobs, clusters, recommendations). The client returns the
+# same listing objects while its cached responses are fresh, so list identity
+# tells whether the previous recommendations still apply.
+_basic_analysis_memo: Tuple[Any, Any, Optional[List[Dict[str, Any]]]] = (None, None, None)
+
+# Shared stand-in for a pool without a status; only ever read
+_NO_POOL_STATUS: Dict[str, Any] = {}
+
+
+@lru_cache(maxsize=256)
+def parse_estimated_savings(savings_str: str) -> Optional[float]:
+    """Extract the numeric value of an estimated_savings string.
+    
+    Handles "$500/month", "30%", etc. Recommendations reuse a handful of
+    savings strings, so parsed values are memoized per distinct string.
+    
+    Args:
+        savings_str: Recommendation's estimated_savings text
+    
+    Returns:
+        Savings value (percentages scaled by 100 as a rough base amount), or
+        None if the text contains no number
+    """
+    match = _SAVINGS_NUMBER_RE.search(savings_str)
+    if not match:
+        return None
+    savings_value = float(match.group())
+    # If it's a percentage, estimate based on average (rough calculation)
+    if '%' in savings_str:
+        savings_value = savings_value * 100  # Rough estimate: treat % as base amount
+    return savings_value
+
+
+def perform_basic_analysis(jobs, clusters):
+    """Perform rule-based analysis without AI.
+    
+    Repeated calls with the same job and cluster lists return the previous
+    result without re-running the rules.
+    
+    Args:
+        jobs: Job listing from the Databricks client
+        clusters: Cluster listing from the Databricks client
+    
+    Returns:
+        Recommendations; shared between calls, so copy the list before
+        adding to it
+    """
+    global _basic_analysis_memo
+    memo_jobs, memo_clusters, recommendations = _basic_analysis_memo
+    if memo_jobs is not jobs or memo_clusters is not clusters:
+        recommendations = _analyze(jobs, clusters)
+        _basic_analysis_memo = (jobs, clusters, recommendations)
+    return recommendations
+
+
+def _analyze(jobs, clusters):
+    """Run the cluster and job rules behind perform_basic_analysis."""
+    recommendations = []
+    
+    # Analyze clusters
+    for cluster in clusters:
+        state = cluster.get("state", "")
+        num_workers = cluster.get("num_workers", 0)
+        cluster_name = cluster.get("cluster_name", "Unknown")
+        cluster_id = cluster.get("cluster_id")
+        
+        # Check for running clusters that might be idle
+        if state == "RUNNING":
+            if num_workers > 0:
+                recommendations.append({
+                    "id": f"rec_{len(recommendations)}",
+                    "type": "cost_leak",
+                    "severity": "medium",
+                    "title": f"Running cluster: {cluster_name}",
+                    "description": f"Cluster is running with {num_workers} workers. Monitor for idle time and consider auto-termination if not actively used.",
+                    "resource_type": "cluster",
+                    "resource_id": cluster_id,
+                    "current_config": {
+                        "num_workers": num_workers,
+                        "node_type": cluster.get("node_type_id"),
+                        "state": state,
+                        "autotermination_minutes": cluster.get("autotermination_minutes"),
+                    },
+                    "recommended_config": {
+                        "action": "Set auto-termination if cluster is idle for extended periods",
+                        "suggested_autotermination": 15,
+                    },
+                    "estimated_savings": "Medium - depends on idle time",
+                    "risk": "Low",
+                })
+            else:
+                # Single node cluster
+                recommendations.append({
+                    "id": f"rec_{len(recommendations)}",
+                    "type": "optimization",
+                    "severity": "low",
+                    "title": f"Single-node cluster: {cluster_name}",
+                    "description": "Single-node cluster detected. Suitable for lightweight workloads.",
+                    "resource_type": "cluster",
+                    "resource_id": cluster_id,
+                    "current_config": {
+                        "num_workers": 0,
+                        "node_type": cluster.get("node_type_id"),
+                    },
+                    "recommended_config": {
+                        "action": "Continue using single-node for cost efficiency",
+                    },
+                    "estimated_savings": "Already optimized",
+                    "risk": "None",
+                })
+        
+        # Check for terminated clusters that were recently active
+        elif state == "TERMINATED":
+            terminated_time = cluster.get("terminated_time")
+            if terminated_time:
+                # Could add logic to check if it was terminated recently
+                pass
+    
+    # Analyze jobs
+    for job in jobs:
+        job_name = job.get("job_name", "Unknown")
+        job_id = job.get("job_id")
+        tasks = job.get("settings", {}).get("tasks", [])
+        
+        if len(tasks) == 0:
+            recommendations.append({
+                "id": f"rec_{len(recommendations)}",
+                "type": "optimization",
+                "severity": "low",
+                "title": f"Job with no tasks: {job_name}",
+                "description": "Job has no configured tasks. Consider reviewing job configuration.",
+                "resource_type": "job",
+                "resource_id": job_id,
+                "estimated_savings": "N/A",
+                "risk": "Low",
+            })
+    
+    # If no recommendations, add a summary
+    if len(recommendations) == 0:
+        recommendations.append({
+            "id": "rec_summary",
+            "type": "info",
+            "severity": "low",
+            "title": "Analysis Complete",
+            "description": f"Analyzed {len(jobs)} jobs and {len(clusters)} clusters. No immediate optimization opportunities detected.",
+            "estimated_savings": "Continue monitoring",
+            "risk": "None",
+        })
+    
+    return recommendations
+
+
+def perform_compute_analysis(sql_warehouses, pools, first_index=0):
+    """Flag running SQL warehouses and unused instance pools.
+    
+    Args:
+        sql_warehouses: SQL warehouse listing from the Databricks client
+        pools: Instance pool listing from the Databricks client
+        first_index: Number of recommendations these follow; ids continue from it
+    
+    Returns:
+        New recommendations, warehouses first
+    """
+    recommendations = []
+    
+    for warehouse in sql_warehouses:
+        if warehouse.get("state") == "RUNNING":
+            recommendations.append({
+                "id": f"rec_warehouse_{first_index + len(recommendations)}",
+                "type": "cost_leak",
+                "severity": "medium",
+                "title": f"Running SQL Warehouse: {warehouse.get('name', 'Unknown')}",
+                "description": "SQL warehouse is running. Monitor usage and consider auto-stop if idle.",
+                "resource_type": "sql_warehouse",
+                "resource_id": warehouse.get("id"),
+                "estimated_savings": "Medium",
+                "risk": "Low",
+            })
+    
+    for pool in pools:
+        if pool.get("status", _NO_POOL_STATUS).get("instance_use_count", 0) == 0:
+            recommendations.append({
+                "id": f"rec_pool_{first_index + len(recommendations)}",
+                "type": "cost_leak",
+                "severity": "low",
+                "title": f"Unused Instance Pool: {pool.get('instance_pool_name', 'Unknown')}",
+                "description": "Instance pool has no active instances. Consider reviewing pool configuration.",
+                "resource_type": "pool",
+                "resource_id": pool.get("instance_pool_id"),
+                "estimated_savings": "Low",
+                "risk": "Low",
+            })
+    
+    return recommendations
@@ -0,0 +1,93 @@
+"""Content-Encoding negotiation and compression for JSON responses."""
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional
+import gzip
+import threading
+
+try:
+    import brotli
+except ImportError:  # responses fall back to gzip
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed; fast levels keep the CPU
+# cost low while still shrinking JSON several times over
+_COMPRESS_MIN_SIZE = 1024
+_BROTLI_QUALITY = 4
+_GZIP_LEVEL = 1
+# Compressed forms of recently sent bodies: (encoding, id(body)) -> (body,
+# compressed). Memoized bodies are the same object across requests, so their
+# compressed form is reused too.
+_COMPRESSED_BODIES_SIZE = 16
+_compressed_bodies = OrderedDict()
+_compressed_bodies_lock = threading.Lock()
+
+
+@lru_cache(maxsize=64)
+def _accepted_codings(accept_encoding: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into lowercase coding -> q-value.
+    
+    Clients send a handful of distinct headers, so parses are memoized.
+    Malformed q-values count as 0.
+    """
+    codings = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        codings[coding] = quality
+    return codings
+
+
+def choose_encoding(accept_encoding: str, size: int) -> Optional[str]:
+    """Pick the Content-Encoding for a response body.
+    
+    Args:
+        accept_encoding: The request's Accept-Encoding header
+        size: Length of the uncompressed body
+    
+    Returns:
+        "br" or "gzip", whichever acceptable coding the client ranks higher
+        (br on a tie), or None to send the body as is. Codings with q=0 are
+        refused, and "*" stands for the codings the header does not list.
+    """
+    if size < _COMPRESS_MIN_SIZE:
+        return None
+    codings = _accepted_codings(accept_encoding)
+    wildcard = codings.get("*", 0.0)
+    candidates = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_quality = None, 0.0
+    for coding in candidates:
+        quality = codings.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with brotli ('br') or gzip, reusing recent results."""
+    key = (encoding, id(body))
+    with _compressed_bodies_lock:
+        entry = _compressed_bodies.get(key)
+        if entry is not None and entry[0] is body:
+            _compressed_bodies.move_to_end(key)
+            return entry[1]
+    if encoding == 'br':
+        compressed = brotli.compress(body, quality=_BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(body, compresslevel=_GZIP_LEVEL)
+    with _compressed_bodies_lock:
+        _compressed_bodies[key] = (body, compressed)
+        _compressed_bodies.move_to_end(key)
+        while len(_compressed_bodies) > _COMPRESSED_BODIES_SIZE:
+            _compressed_bodies.popitem(last=False)
+    return compressed
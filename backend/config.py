@@ -16,11 +16,15 @@ class Settings:
     # OpenAI Configuration
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
     openai_model: str = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+    # Cheaper model for small analyses and triage of large ones; opt-in, empty
+    # always uses OPENAI_MODEL
+    openai_fast_model: str = os.getenv("OPENAI_FAST_MODEL", "")
     
     # Azure OpenAI (alternative)
     azure_openai_endpoint: str = os.getenv("AZURE_OPENAI_ENDPOINT", "")
     azure_openai_api_key: str = os.getenv("AZURE_OPENAI_API_KEY", "")
     azure_openai_deployment_name: str = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "")
+    azure_openai_fast_deployment_name: str = os.getenv("AZURE_OPENAI_FAST_DEPLOYMENT_NAME", "")
     
     # Server Configuration
     backend_port: int = int(os.getenv("BACKEND_PORT", "8000"))
@@ -0,0 +1,76 @@
+"""Shared pytest fixtures for the ClusterIQ integration tests.
+
+The clients are created once per test session (per worker under
+pytest-xdist), so their connection pools and TLS sessions are reused by every
+test. Tests that need credentials missing from the environment or .env are
+skipped rather than failed.
+
+Run from the backend directory with ``pytest``, or ``pytest -n auto --dist
+loadscope`` with pytest-xdist installed.
+"""
+import os
+
+import pytest
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Model the agent is created with
+TEST_MODEL = "gpt-4-turbo-preview"
+
+
+@pytest.fixture(scope="session")
+def databricks_client():
+    """DatabricksClient for the workspace in DATABRICKS_HOST."""
+    host = os.getenv("DATABRICKS_HOST", "")
+    token = os.getenv("DATABRICKS_TOKEN", "")
+    if not host or not token:
+        pytest.skip("DATABRICKS_HOST and DATABRICKS_TOKEN must be set in .env")
+    
+    from databricks_client import DatabricksClient
+    client = DatabricksClient(host=host, token=token)
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def azure_openai_config():
+    """Azure OpenAI endpoint, API key and deployment name."""
+    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT", "")
+    api_key = os.getenv("AZURE_OPENAI_API_KEY", "")
+    deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "")
+    if not all([endpoint, api_key, deployment]):
+        pytest.skip("Azure OpenAI credentials not configured")
+    return {"endpoint": endpoint.rstrip('/'), "api_key": api_key, "deployment": deployment}
+
+
+@pytest.fixture(scope="session")
+def openai_api_key():
+    """Standard OpenAI API key."""
+    api_key = os.getenv("OPENAI_API_KEY", "")
+    if not api_key:
+        pytest.skip("OpenAI API key not configured")
+    return api_key
+
+
+@pytest.fixture(scope="session")
+def clusteriq_agent():
+    """ClusterIQAgent on Azure OpenAI if configured, else standard OpenAI."""
+    from ai_agent import ClusterIQAgent
+    
+    azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT", "")
+    azure_api_key = os.getenv("AZURE_OPENAI_API_KEY", "")
+    azure_deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "")
+    openai_api_key = os.getenv("OPENAI_API_KEY", "")
+    
+    # Try Azure OpenAI first, then standard OpenAI
+    if azure_endpoint and azure_api_key and azure_deployment:
+        return ClusterIQAgent(
+            azure_endpoint=azure_endpoint,
+            azure_api_key=azure_api_key,
+            azure_deployment_name=azure_deployment,
+            model=TEST_MODEL
+        )
+    if openai_api_key:
+        return ClusterIQAgent(api_key=openai_api_key, model=TEST_MODEL)
+    pytest.skip("No OpenAI credentials configured")
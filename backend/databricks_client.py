@@ -1,20 +1,364 @@
 """Databricks API client using direct HTTP requests (curl-style)."""
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, AsyncIterator, Tuple, Callable
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from itertools import islice
+import asyncio
+import importlib.util
+import re
+import threading
+import time
+import httpx
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 multiplexes concurrent async calls over one connection when the
+# optional h2 package is installed
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+_ASYNC_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+# Bound on cached API results (job runs are cached per job)
+_RESPONSE_CACHE_SIZE = 128
+
+# Safety bound on pages followed for one paginated listing
+_MAX_PAGES = 100
+
+# Threads shared by the sync fan-outs (jobs with clusters, bulk job runs,
+# compute resources); concurrent requests queue on them instead of each
+# starting its own pool
+_FETCH_WORKERS = 16
+
+# Page sizes for the paginated list endpoints (the API maximum where known);
+# jobs are listed without their expanded task settings, the API default
+_JOBS_LIST_PARAMS = {"limit": 100, "expand_tasks": "false"}
+_CLUSTERS_LIST_PARAMS = {"page_size": 100}
+_MLFLOW_SEARCH_PARAMS = {"max_results": 1000}
+_FEATURE_TABLES_SEARCH_PARAMS = {"max_results": 200}
+
+
+def _cache_key(path: str, params: Optional[Dict[str, Any]] = None) -> tuple:
+    """Return the response cache key of a request."""
+    return (path, tuple(sorted((params or {}).items())))
+
+
+def _parse_body(content: bytes) -> Any:
+    """Decode a JSON response body; an empty body decodes to an empty object."""
+    return orjson.loads(content) if content else {}
+
+
+def _normalize_state(state: Any) -> str:
+    """Return a cluster state as a string; the API may return a dict or nothing."""
+    # An exact class check skips isinstance's subclass handling; this runs per cluster
+    return state.get("cluster_state", "UNKNOWN") if state.__class__ is dict else ("UNKNOWN" if state is None else state)
+
+
+def _transform_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a job task onto the fields used downstream."""
+    get = task.get
+    return {
+        "task_key": get("task_key"),
+        "description": get("description"),
+        "timeout_seconds": get("timeout_seconds"),
+        "cluster_id": get("existing_cluster_id"),
+        "new_cluster": get("new_cluster"),
+    }
+
+
+def _transform_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a jobs/list entry onto the job shape used downstream."""
+    get = job.get
+    settings = get("settings") or {}
+    settings_get = settings.get
+    return {
+        "job_id": get("job_id"),
+        "job_name": settings_get("name", "Unknown"),
+        "created_time": get("created_time"),
+        "creator_user_name": get("creator_user_name"),
+        "settings": {
+            "timeout_seconds": settings_get("timeout_seconds"),
+            "max_concurrent_runs": settings_get("max_concurrent_runs"),
+            "tasks": [_transform_task(task) for task in settings_get("tasks", ())],
+        },
+        "schedule": settings_get("schedule"),
+    }
+
+
+def _transform_jobs(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Transform a jobs/list response body into job dictionaries."""
+    return [_transform_job(job) for job in data.get("jobs", ())]
+
+
+def _transform_runs(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Transform a jobs/runs/list response body into run dictionaries."""
+    return [_transform_run(run) for run in data.get("runs", ())]
+
+
+def _transform_task_run(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a task entry of a job run onto the fields used downstream."""
+    get = task.get
+    start_time = get("start_time")
+    end_time = get("end_time")
+    return {
+        "task_key": get("task_key"),
+        "run_id": get("run_id"),
+        "state": get("state", {}).get("life_cycle_state"),
+        "start_time": start_time,
+        "end_time": end_time,
+        "duration": (end_time - start_time) / 1000 if end_time and start_time else None,
+    }
+
+
+def _transform_run(run: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a jobs/runs/list entry onto the run shape used downstream."""
+    get = run.get
+    start_time = get("start_time")
+    end_time = get("end_time")
+    duration = None
+    if start_time and end_time:
+        duration = (end_time - start_time) / 1000  # Convert ms to seconds
+    
+    state = get("state", {})
+    cluster_instance = get("cluster_instance")
+    return {
+        "run_id": get("run_id"),
+        "job_id": get("job_id"),
+        "run_name": get("run_name"),
+        "state": {
+            "life_cycle_state": state.get("life_cycle_state"),
+            "result_state": state.get("result_state"),
+            "state_message": state.get("state_message"),
+        },
+        "start_time": start_time,
+        "end_time": end_time,
+        "duration": duration,
+        "cluster_instance": {
+            "cluster_id": cluster_instance.get("cluster_id"),
+        } if cluster_instance else None,
+        "tasks": [_transform_task_run(task) for task in get("tasks", ())],
+    }
+
+
+def _transform_cluster(cluster: Dict[str, Any]) -> Dict[str, Any]:
+    """Project a clusters/list entry onto the cluster shape used downstream."""
+    get = cluster.get
+    autoscale = get("autoscale")
+    return {
+        "cluster_id": get("cluster_id"),
+        "cluster_name": get("cluster_name") or f"Cluster-{get('cluster_id')}",
+        "state": _normalize_state(get("state")),
+        "spark_version": get("spark_version"),
+        "node_type_id": get("node_type_id"),
+        "driver_node_type_id": get("driver_node_type_id"),
+        "num_workers": get("num_workers", 0),
+        "autotermination_minutes": get("autotermination_minutes"),
+        "enable_elastic_disk": get("enable_elastic_disk"),
+        "cluster_source": get("cluster_source"),
+        "start_time": get("start_time"),
+        "terminated_time": get("terminated_time"),
+        "last_activity_time": get("last_activity_time"),
+        "cluster_memory_mb": get("cluster_memory_mb"),
+        "cluster_cores": get("cluster_cores"),
+        "default_tags": get("default_tags", {}),
+        "spark_conf": get("spark_conf", {}),
+        "autoscale": {
+            "min_workers": autoscale.get("min_workers"),
+            "max_workers": autoscale.get("max_workers"),
+        } if autoscale else None,
+    }
+
+
+def _transform_clusters(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Transform a clusters/list response body into cluster dictionaries.
+    
+    A cluster that fails to transform is kept with its basic info and an error.
+    """
+    clusters_data = data.get("clusters", [])
+    logger.info("Found %s clusters in API response", len(clusters_data))
+    
+    try:
+        clusters = [_transform_cluster(cluster) for cluster in clusters_data]
+    except Exception:
+        # Redo row by row so one malformed cluster doesn't drop the rest
+        clusters = [_transform_cluster_or_error(cluster) for cluster in clusters_data]
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        for cluster_dict in clusters:
+            logger.debug("Added cluster: %s (State: %s)", cluster_dict["cluster_name"], cluster_dict["state"])
+    return clusters
+
+
+def _transform_cluster_or_error(cluster: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform one cluster, falling back to its basic info and an error."""
+    try:
+        return _transform_cluster(cluster)
+    except Exception as cluster_error:
+        logger.warning("Error processing cluster %s: %s", cluster.get('cluster_id'), cluster_error)
+        # Add basic info even if processing fails
+        return {
+            "cluster_id": cluster.get("cluster_id"),
+            "cluster_name": cluster.get("cluster_name", f"Cluster-{cluster.get('cluster_id')}"),
+            "state": cluster.get("state", "UNKNOWN"),
+            "error": f"Could not process: {str(cluster_error)}"
+        }
+
+
+def _extract_warehouses(data: Any) -> List[Dict[str, Any]]:
+    """Extract the warehouse list from a SQL warehouses response body."""
+    # Handle different response formats
+    warehouses = []
+    if isinstance(data, list):
+        warehouses = data
+    elif isinstance(data, dict):
+        # Try common keys for warehouse list
+        warehouses = data.get("warehouses", [])
+        if not warehouses:
+            warehouses = data.get("results", [])
+        if not warehouses and "warehouse_id" in data:
+            # Single warehouse response
+            warehouses = [data]
+    return warehouses
+
+
+# Lakebase might be under Unity Catalog or a different endpoint; tried in order
+# Response cache key for the combined Lakebase probe result
+_LAKEBASE_CACHE_KEY = ("lakebase", ())
+
+_LAKEBASE_ENDPOINTS = (
+    "/api/2.1/unity-catalog/storage-credentials",
+    "/api/2.1/unity-catalog/external-locations",
+    "/api/2.0/lakebase/provisioned",
+)
+
+
+def _extract_lakebase(data: Any) -> List[Dict[str, Any]]:
+    """Extract Lakebase resources from a response of one of _LAKEBASE_ENDPOINTS."""
+    # Handle different response formats
+    if isinstance(data, list):
+        return data
+    resources = []
+    if isinstance(data, dict):
+        # Try common keys
+        for key in ["storage_credentials", "external_locations", "resources", "items"]:
+            if key in data:
+                resources.extend(data[key] if isinstance(data[key], list) else [data[key]])
+    return resources
+
+
+_ML_KEYWORDS = ('ml', 'machine learning', 'model', 'training', 'inference', 'mlflow',
+                'pytorch', 'tensorflow', 'xgboost', 'sklearn', 'spark ml', 'pipeline')
+
+# One pattern scanning a string for every keyword at once
+_ML_KEYWORDS_RE = re.compile("|".join(map(re.escape, _ML_KEYWORDS)), re.IGNORECASE)
+
+
+def _is_ml_task(task: Dict[str, Any]) -> bool:
+    """Return whether a task's key, notebook path or Python file mentions an ML keyword."""
+    # Joined with newlines so a keyword can't match across two fields
+    text = "\n".join((
+        task.get("task_key") or "",
+        (task.get("notebook_task") or {}).get("notebook_path") or "",
+        (task.get("spark_python_task") or {}).get("python_file") or "",
+    ))
+    return _ML_KEYWORDS_RE.search(text) is not None
+
+
+def _filter_ml_jobs(all_jobs: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Select the jobs that look like ML/AI workloads by name or task keywords."""
+    search = _ML_KEYWORDS_RE.search
+    return [
+        {
+            **job,
+            "ml_category": "ML/AI Job",
+            "detected_by": "keyword_match"
+        }
+        for job in all_jobs
+        # Check the job name, then task configurations for ML libraries
+        if search(job.get("job_name") or "")
+        or any(_is_ml_task(task) for task in job.get("settings", {}).get("tasks", []))
+    ]
+
+
+# Columns of the columnar cluster view
+_CLUSTER_COLUMNS = (
+    "cluster_id", "cluster_name", "state", "num_workers", "node_type_id",
+    "cluster_source", "autotermination_minutes",
+)
+
+
+def _cluster_columns(clusters: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Transpose cluster dictionaries into one list per _CLUSTER_COLUMNS field."""
+    columns = zip(*(tuple(map(cluster.get, _CLUSTER_COLUMNS)) for cluster in clusters))
+    return dict(zip(_CLUSTER_COLUMNS, (list(column) for column in columns))) or {
+        name: [] for name in _CLUSTER_COLUMNS
+    }
+
+
+def _split_clusters(clusters: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Split clusters into all-purpose and job clusters by cluster_source."""
+    return {
+        "all_purpose_clusters": [cluster for cluster in clusters if cluster.get("cluster_source") != "JOB"],
+        "job_clusters": [cluster for cluster in clusters if cluster.get("cluster_source") == "JOB"],
+    }
+
+
+# Keys of get_all_compute_resources, in response order; both cluster keys
+# come from one clusters listing
+_COMPUTE_RESOURCE_KEYS = (
+    "all_purpose_clusters", "job_clusters", "sql_warehouses", "vector_search",
+    "pools", "policies", "apps", "lakebase_provisioned", "ml_jobs",
+    "mlflow_experiments", "mlflow_models", "model_serving_endpoints",
+    "feature_store_tables",
+)
+_CLUSTER_KEYS = frozenset({"all_purpose_clusters", "job_clusters"})
+
+
+def _compute_keys(include: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Return the compute resource keys to fetch, in response order (all if include is None)."""
+    if include is None:
+        return _COMPUTE_RESOURCE_KEYS
+    include = set(include)
+    return tuple(key for key in _COMPUTE_RESOURCE_KEYS if key in include)
+
+
+# Async fetch specs for the list endpoints of get_all_compute_resources:
+# result key -> (HTTP method, path, extractor, label for logs, params, items
+# key of a paginated listing or None)
+_ASYNC_LIST_ENDPOINTS = {
+    "sql_warehouses": ("GET", "/api/2.0/sql/warehouses", _extract_warehouses, "SQL warehouses", None, None),
+    "vector_search": ("GET", "/api/2.0/vector-search/endpoints", lambda data: data.get("endpoints", []), "Vector Search endpoints", None, "endpoints"),
+    "pools": ("GET", "/api/2.0/instance-pools/list", lambda data: data.get("instance_pools", []), "instance pools", None, None),
+    "policies": ("GET", "/api/2.1/policies/clusters/list", lambda data: data.get("policies", []), "cluster policies", None, None),
+    "apps": ("GET", "/api/2.0/apps/list", lambda data: data.get("apps", []), "apps", None, "apps"),
+    "mlflow_experiments": ("POST", "/api/2.0/mlflow/experiments/search", lambda data: data.get("experiments", []), "MLflow experiments", _MLFLOW_SEARCH_PARAMS, "experiments"),
+    "mlflow_models": ("POST", "/api/2.0/mlflow/registered-models/search", lambda data: data.get("registered_models", []), "MLflow models", _MLFLOW_SEARCH_PARAMS, "registered_models"),
+    "model_serving_endpoints": ("GET", "/api/2.0/serving-endpoints", lambda data: data.get("endpoints", []), "model serving endpoints", None, None),
+    "feature_store_tables": ("POST", "/api/2.0/feature-store/feature-tables/search", lambda data: data.get("feature_tables", []), "feature store tables", _FEATURE_TABLES_SEARCH_PARAMS, "feature_tables"),
+}
+
 
 class DatabricksClient:
     """Client for interacting with Databricks APIs using direct HTTP requests."""
     
-    def __init__(self, host: str, token: str):
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        cache_ttl: float = 30,
+        metrics_cache_ttl: float = 5
+    ):
         """Initialize Databricks client.
         
         Args:
             host: Databricks workspace URL
             token: Databricks personal access token
+            cache_ttl: Seconds to reuse job, cluster and run listings (0 revalidates
+                every call, reusing the result only on a 304)
+            metrics_cache_ttl: Seconds to reuse per-cluster metrics
         """
         self.host = host.rstrip('/')  # Remove trailing slash
         self.token = token
@@ -22,7 +366,319 @@ class DatabricksClient:
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json"
         }
-        logger.info(f"Databricks client initialized for host: {self.host}")
+        
+        # One keep-alive session for every API call, so repeated requests reuse
+        # pooled TCP/TLS connections; transient errors and throttling are retried.
+        # Accept-Encoding is left to requests/httpx: both advertise br on top
+        # of gzip when brotli is installed, and only what they can decode.
+        # All calls go to one host, so a single pool sized for the concurrent
+        # fan-outs (bulk job runs, compute resources) is enough.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                # Throttled 429/503 responses wait as long as the API asks
+                respect_retry_after_header=True,
+                # The client's POSTs are read-only search calls, safe to retry
+                allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"},
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # Worker threads start on first submit and are reused afterwards
+        self._executor = ThreadPoolExecutor(max_workers=_FETCH_WORKERS, thread_name_prefix="databricks-fetch")
+        
+        # Async counterpart of the session, created on first use since it is
+        # bound to the event loop that runs the async methods
+        self._async_client: Optional[httpx.AsyncClient] = None
+        
+        # Transformed GET results keyed by (path, params): (expires_at, etag,
+        # result). Fresh entries skip the request; stale ones are revalidated
+        # with If-None-Match so a 304 skips the download and transform.
+        # Cached results are shared between callers and must not be mutated.
+        self.cache_ttl = cache_ttl
+        self.metrics_cache_ttl = metrics_cache_ttl
+        self._response_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        # Per-key locks so concurrent misses for one endpoint share a single fetch
+        self._fetch_locks: Dict[tuple, threading.Lock] = {}
+        # Lakebase endpoint found by the probe, so later calls request only
+        # that one; "" once every candidate answered 404, None until probed
+        self._lakebase_endpoint: Optional[str] = None
+        # Columnar view of the cluster listing it was built from
+        self._cluster_columns: Optional[Tuple[List[Dict[str, Any]], Dict[str, List[Any]]]] = None
+        logger.info("Databricks client initialized for host: %s", self.host)
+    
+    def _cache_lookup(self, key: tuple) -> Tuple[bool, Optional[tuple]]:
+        """Return (fresh, entry) for a response cache key."""
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+            if entry is not None:
+                self._response_cache.move_to_end(key)
+        return entry is not None and entry[0] > time.monotonic(), entry
+    
+    def _cache_store(self, key: tuple, etag: Optional[str], result: Any, ttl: float) -> None:
+        """Store a transformed result, evicting the least recently used entry.
+        
+        With a non-positive ``ttl`` the result is kept only if it has an ETag,
+        already stale, so the next call revalidates it with If-None-Match.
+        """
+        if ttl <= 0 and not etag:
+            return
+        with self._response_cache_lock:
+            self._response_cache[key] = (time.monotonic() + max(ttl, 0), etag, result)
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+    
+    def _fetch_lock(self, key: tuple) -> threading.Lock:
+        """Return the lock serializing fetches for a response cache key."""
+        with self._response_cache_lock:
+            lock = self._fetch_locks.get(key)
+            if lock is None:
+                lock = self._fetch_locks[key] = threading.Lock()
+            return lock
+    
+    def _cached_get(
+        self,
+        path: str,
+        transform: Callable[[Dict[str, Any]], Any],
+        params: Optional[Dict[str, Any]] = None,
+        ttl: Optional[float] = None,
+        method: str = "GET",
+        items_key: Optional[str] = None
+    ) -> Any:
+        """Request an API path and return ``transform`` of its JSON, cached with ETags.
+        
+        Concurrent callers missing the same key wait for one request instead of
+        each issuing their own. ``method`` "POST" sends ``params`` as the JSON
+        body, for the read-only search endpoints. With ``items_key`` the path
+        is a paginated listing: every page is fetched and their ``items_key``
+        lists are joined before ``transform`` runs.
+        
+        Raises:
+            requests.HTTPError: If the request fails
+        """
+        ttl = self.cache_ttl if ttl is None else ttl
+        key = _cache_key(path, params)
+        fresh, entry = self._cache_lookup(key)
+        if fresh:
+            return entry[2]
+        
+        with self._fetch_lock(key):
+            # Another thread may have refreshed the entry while this one waited
+            fresh, entry = self._cache_lookup(key)
+            if fresh:
+                return entry[2]
+            return self._fetch_and_store(key, path, transform, params, ttl, method, entry, items_key)
+    
+    def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """Send a request on the pooled session; POST sends ``params`` as JSON."""
+        url = f"{self.host}{path}"
+        if method == "POST":
+            return self.session.post(url, json=params or {}, headers=headers, timeout=30)
+        return self.session.get(url, params=params, headers=headers, timeout=30)
+    
+    def _fetch_and_store(
+        self,
+        key: tuple,
+        path: str,
+        transform: Callable[[Dict[str, Any]], Any],
+        params: Optional[Dict[str, Any]],
+        ttl: float,
+        method: str,
+        entry: Optional[tuple],
+        items_key: Optional[str] = None
+    ) -> Any:
+        """Issue the request for a cache miss and store the transformed result."""
+        headers = {"If-None-Match": entry[1]} if entry and entry[1] else None
+        response = self._request(method, path, params, headers)
+        etag = response.headers.get("ETag") or (entry[1] if entry else None)
+        if response.status_code == 304 and entry:
+            result = entry[2]
+        else:
+            response.raise_for_status()
+            body = _parse_body(response.content)
+            if items_key and body.get("next_page_token"):
+                body[items_key] = list(self._paginate(path, items_key, params, method, body))
+                # The ETag only covers the first page
+                etag = None
+            result = transform(body)
+        self._cache_store(key, etag, result, ttl)
+        return result
+    
+    def _paginate(
+        self,
+        path: str,
+        items_key: str,
+        params: Optional[Dict[str, Any]] = None,
+        method: str = "GET",
+        first_page: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Any]:
+        """Yield the items of a paginated listing, requesting pages lazily.
+        
+        Pages are followed through ``next_page_token``, so callers that stop
+        early (e.g. with ``itertools.islice``) skip the remaining requests.
+        
+        Args:
+            path: API path of the listing
+            items_key: Key of the item list in each page
+            params: Query parameters (JSON body for POST) of the first page
+            method: HTTP method of the listing
+            first_page: Already decoded first page, if any
+            
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        params = dict(params or {})
+        page = first_page
+        for _ in range(_MAX_PAGES):
+            if page is None:
+                response = self._request(method, path, params)
+                response.raise_for_status()
+                page = _parse_body(response.content)
+            yield from page.get(items_key) or ()
+            token = page.get("next_page_token")
+            if not token:
+                return
+            params["page_token"] = token
+            page = None
+        logger.warning("Stopped listing %s after %s pages", path, _MAX_PAGES)
+    
+    def _iter_listing(
+        self,
+        path: str,
+        items_key: str,
+        transform_item: Callable[[Dict[str, Any]], Any],
+        params: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Any]:
+        """Yield transformed items of a listing, reusing its cached result when fresh.
+        
+        On a cache miss pages are requested and transformed lazily, without
+        building or caching the full list.
+        """
+        fresh, entry = self._cache_lookup(_cache_key(path, params))
+        if fresh:
+            yield from entry[2]
+            return
+        yield from map(transform_item, self._paginate(path, items_key, params))
+    
+    async def _acached_get(
+        self,
+        path: str,
+        transform: Callable[[Dict[str, Any]], Any],
+        params: Optional[Dict[str, Any]] = None,
+        ttl: Optional[float] = None,
+        method: str = "GET",
+        items_key: Optional[str] = None
+    ) -> Any:
+        """Async variant of _cached_get, sharing its cache."""
+        ttl = self.cache_ttl if ttl is None else ttl
+        key = _cache_key(path, params)
+        fresh, entry = self._cache_lookup(key)
+        if fresh:
+            return entry[2]
+        
+        headers = {"If-None-Match": entry[1]} if entry and entry[1] else None
+        response = await self._arequest(method, path, params, headers)
+        etag = response.headers.get("ETag") or (entry[1] if entry else None)
+        if response.status_code == 304 and entry:
+            result = entry[2]
+        else:
+            response.raise_for_status()
+            body = _parse_body(response.content)
+            if items_key and body.get("next_page_token"):
+                body[items_key] = [item async for item in self._apaginate(path, items_key, params, method, body)]
+                # The ETag only covers the first page
+                etag = None
+            result = transform(body)
+        self._cache_store(key, etag, result, ttl)
+        return result
+    
+    async def _arequest(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """Async variant of _request, on the pooled async client."""
+        client = self._get_async_client()
+        if method == "POST":
+            return await client.post(path, json=params or {}, headers=headers)
+        return await client.get(path, params=params, headers=headers)
+    
+    async def _apaginate(
+        self,
+        path: str,
+        items_key: str,
+        params: Optional[Dict[str, Any]] = None,
+        method: str = "GET",
+        first_page: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Any]:
+        """Async variant of _paginate."""
+        params = dict(params or {})
+        page = first_page
+        for _ in range(_MAX_PAGES):
+            if page is None:
+                response = await self._arequest(method, path, params)
+                response.raise_for_status()
+                page = _parse_body(response.content)
+            for item in page.get(items_key) or ():
+                yield item
+            token = page.get("next_page_token")
+            if not token:
+                return
+            params["page_token"] = token
+            page = None
+        logger.warning("Stopped listing %s after %s pages", path, _MAX_PAGES)
+    
+    def clear_cache(self, path: Optional[str] = None) -> None:
+        """Drop cached results, e.g. to force a refresh after changing resources.
+        
+        Args:
+            path: API path whose results to drop (all results if omitted)
+        """
+        with self._response_cache_lock:
+            if path is None:
+                self._response_cache.clear()
+                self._lakebase_endpoint = None
+                return
+            for key in [key for key in self._response_cache if key[0] == path]:
+                del self._response_cache[key]
+    
+    def _lakebase_candidates(self) -> Tuple[str, ...]:
+        """Return the Lakebase endpoints to request: the probed one, or all candidates."""
+        if self._lakebase_endpoint is None:
+            return _LAKEBASE_ENDPOINTS
+        return (self._lakebase_endpoint,) if self._lakebase_endpoint else ()
+    
+    def _record_lakebase_probe(self, endpoint: Optional[str], all_not_found: bool) -> None:
+        """Remember the outcome of requesting the Lakebase candidates.
+        
+        Args:
+            endpoint: Endpoint that answered 200, if any
+            all_not_found: Whether every requested endpoint answered 404
+        """
+        if endpoint:
+            self._lakebase_endpoint = endpoint
+        elif all_not_found and not self._lakebase_endpoint:
+            self._lakebase_endpoint = ""
+        else:
+            # A remembered endpoint stopped answering, or the probe hit errors
+            self._lakebase_endpoint = None
     
     def get_all_jobs(self) -> List[Dict[str, Any]]:
         """Fetch all jobs from Databricks workspace using REST API.
@@ -32,47 +688,26 @@ class DatabricksClient:
         """
         try:
             url = f"{self.host}/api/2.1/jobs/list"
-            logger.info(f"Fetching jobs from: {url}")
-            
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            jobs = data.get("jobs", [])
+            logger.info("Fetching jobs from: %s", url)
             
             # Transform to match expected format
-            job_list = []
-            for job in jobs:
-                job_dict = {
-                    "job_id": job.get("job_id"),
-                    "job_name": job.get("settings", {}).get("name", "Unknown"),
-                    "created_time": job.get("created_time"),
-                    "creator_user_name": job.get("creator_user_name"),
-                    "settings": {
-                        "timeout_seconds": job.get("settings", {}).get("timeout_seconds"),
-                        "max_concurrent_runs": job.get("settings", {}).get("max_concurrent_runs"),
-                        "tasks": [
-                            {
-                                "task_key": task.get("task_key"),
-                                "description": task.get("description"),
-                                "timeout_seconds": task.get("timeout_seconds"),
-                                "cluster_id": task.get("existing_cluster_id"),
-                                "new_cluster": task.get("new_cluster"),
-                            }
-                            for task in job.get("settings", {}).get("tasks", [])
-                        ],
-                    },
-                    "schedule": job.get("settings", {}).get("schedule"),
-                }
-                job_list.append(job_dict)
+            job_list = self._cached_get("/api/2.1/jobs/list", _transform_jobs, _JOBS_LIST_PARAMS, items_key="jobs")
             
-            logger.info(f"Fetched {len(job_list)} jobs from Databricks")
+            logger.info("Fetched %s jobs from Databricks", len(job_list))
             return job_list
         
         except Exception as e:
-            logger.error(f"Error fetching jobs: {str(e)}", exc_info=True)
+            logger.error("Error fetching jobs: %s", e, exc_info=True)
             return []
     
+    def iter_jobs(self) -> Iterator[Dict[str, Any]]:
+        """Yield the workspace's jobs lazily, in the shape of get_all_jobs.
+        
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_listing("/api/2.1/jobs/list", "jobs", _transform_job, _JOBS_LIST_PARAMS)
+    
     def get_job_runs(self, job_id: int, limit: int = 50) -> List[Dict[str, Any]]:
         """Fetch recent runs for a specific job using REST API.
         
@@ -84,61 +719,219 @@ class DatabricksClient:
             List of run dictionaries
         """
         try:
-            url = f"{self.host}/api/2.1/jobs/runs/list"
             params = {
                 "job_id": job_id,
                 "limit": limit
             }
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            runs_data = data.get("runs", [])
+            return self._cached_get("/api/2.1/jobs/runs/list", _transform_runs, params)
+        
+        except Exception as e:
+            logger.error("Error fetching runs for job %s: %s", job_id, e)
+            return []
+    
+    def iter_runs(self, job_id: int, limit: int = 50) -> Iterator[Dict[str, Any]]:
+        """Yield recent runs of a job lazily, in the shape of get_job_runs.
+        
+        Raises:
+            requests.HTTPError: If the request fails
+        """
+        params = {"job_id": job_id, "limit": limit}
+        # Stop at limit rather than following next_page_token to older runs
+        return islice(self._iter_listing("/api/2.1/jobs/runs/list", "runs", _transform_run, params), limit)
+    
+    def get_job_runs_bulk(
+        self,
+        job_ids: Iterable[int],
+        limit: int = 50,
+        max_workers: int = 16
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Fetch recent runs for several jobs concurrently on the client's shared pool.
+        
+        Args:
+            job_ids: Job IDs to fetch runs for
+            limit: Maximum number of runs to fetch per job
+            max_workers: Maximum number of this call's requests in flight at once
             
-            runs = []
-            for run in runs_data:
-                start_time = run.get("start_time")
-                end_time = run.get("end_time")
-                duration = None
-                if start_time and end_time:
-                    duration = (end_time - start_time) / 1000  # Convert ms to seconds
-                
-                run_dict = {
-                    "run_id": run.get("run_id"),
-                    "job_id": run.get("job_id"),
-                    "run_name": run.get("run_name"),
-                    "state": {
-                        "life_cycle_state": run.get("state", {}).get("life_cycle_state"),
-                        "result_state": run.get("state", {}).get("result_state"),
-                        "state_message": run.get("state", {}).get("state_message"),
-                    },
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "duration": duration,
-                    "cluster_instance": {
-                        "cluster_id": run.get("cluster_instance", {}).get("cluster_id"),
-                    } if run.get("cluster_instance") else None,
-                    "tasks": [
-                        {
-                            "task_key": task.get("task_key"),
-                            "run_id": task.get("run_id"),
-                            "state": task.get("state", {}).get("life_cycle_state"),
-                            "start_time": task.get("start_time"),
-                            "end_time": task.get("end_time"),
-                            "duration": (task.get("end_time") - task.get("start_time")) / 1000 if task.get("end_time") and task.get("start_time") else None,
-                        }
-                        for task in run.get("tasks", [])
-                    ],
-                }
-                runs.append(run_dict)
+        Returns:
+            Dictionary mapping job_id to its list of runs
+        """
+        job_ids = list(dict.fromkeys(job_id for job_id in job_ids if job_id))
+        if not job_ids:
+            return {}
+        
+        # Slots are taken before submitting, so a lower limit never parks
+        # shared pool threads
+        slots = threading.BoundedSemaphore(max_workers)
+        
+        def submit(job_id: int) -> Future:
+            slots.acquire()
+            future = self._executor.submit(self.get_job_runs, job_id, limit)
+            future.add_done_callback(lambda _: slots.release())
+            return future
+        
+        futures = [submit(job_id) for job_id in job_ids]
+        return {job_id: future.result() for job_id, future in zip(job_ids, futures)}
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Return the pooled async HTTP client, creating it on first use."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.host,
+                headers=self.headers,
+                http2=_HTTP2_AVAILABLE,
+                timeout=30,
+                limits=_ASYNC_LIMITS,
+            )
+        return self._async_client
+    
+    async def aget_all_jobs(self) -> List[Dict[str, Any]]:
+        """Async variant of get_all_jobs."""
+        try:
+            job_list = await self._acached_get("/api/2.1/jobs/list", _transform_jobs, _JOBS_LIST_PARAMS, items_key="jobs")
+            logger.info("Fetched %s jobs from Databricks", len(job_list))
+            return job_list
+        
+        except Exception as e:
+            logger.error("Error fetching jobs: %s", e, exc_info=True)
+            return []
+    
+    async def aget_all_clusters(self) -> List[Dict[str, Any]]:
+        """Async variant of get_all_clusters."""
+        try:
+            clusters = await self._acached_get("/api/2.1/clusters/list", _transform_clusters, _CLUSTERS_LIST_PARAMS, items_key="clusters")
+            logger.info("Successfully fetched %s clusters from Databricks", len(clusters))
+            return clusters
+        
+        except Exception as e:
+            logger.error("Error fetching clusters: %s", e, exc_info=True)
+            return []
+    
+    async def aget_job_runs(self, job_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """Async variant of get_job_runs."""
+        try:
+            return await self._acached_get("/api/2.1/jobs/runs/list", _transform_runs, {"job_id": job_id, "limit": limit})
+        
+        except Exception as e:
+            logger.error("Error fetching runs for job %s: %s", job_id, e)
+            return []
+    
+    async def aget_job_runs_bulk(self, job_ids: Iterable[int], limit: int = 50) -> Dict[int, List[Dict[str, Any]]]:
+        """Async variant of get_job_runs_bulk; all requests are issued concurrently."""
+        job_ids = list(dict.fromkeys(job_id for job_id in job_ids if job_id))
+        results = await asyncio.gather(*(self.aget_job_runs(job_id, limit) for job_id in job_ids))
+        return dict(zip(job_ids, results))
+    
+    async def afetch_jobs_and_clusters(
+        self,
+        runs_for_jobs: int = 10,
+        runs_limit: int = 10
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[int, List[Dict[str, Any]]]]:
+        """Fetch jobs, clusters and recent job runs with concurrent requests.
+        
+        Jobs and clusters are fetched together, then the runs of the first
+        ``runs_for_jobs`` jobs are fetched together.
+        
+        Args:
+            runs_for_jobs: Number of jobs to fetch runs for (0 to skip runs)
+            runs_limit: Maximum number of runs to fetch per job
             
-            return runs
+        Returns:
+            Tuple of (jobs, clusters, job_runs by job_id)
+        """
+        jobs, clusters = await asyncio.gather(self.aget_all_jobs(), self.aget_all_clusters())
+        job_runs = await self.aget_job_runs_bulk(
+            (job.get("job_id") for job in jobs[:runs_for_jobs]), limit=runs_limit
+        )
+        return jobs, clusters, job_runs
+    
+    async def _alist(
+        self,
+        method: str,
+        path: str,
+        extract: Callable[[Any], List[Any]],
+        label: str,
+        params: Optional[Dict[str, Any]] = None,
+        items_key: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Fetch a list endpoint asynchronously; errors are logged and yield []."""
+        try:
+            items = await self._acached_get(path, extract, params, method=method, items_key=items_key)
+            logger.info("Fetched %s %s", len(items), label)
+            return items
         
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                logger.warning("%s API endpoint not found. It may not be enabled in this workspace.", label)
+            else:
+                logger.error("HTTP error fetching %s: %s", label, e.response.status_code)
+            return []
         except Exception as e:
-            logger.error(f"Error fetching runs for job {job_id}: {str(e)}")
+            logger.error("Error fetching %s: %s", label, e, exc_info=True)
             return []
     
+    async def aget_lakebase_provisioned(self) -> List[Dict[str, Any]]:
+        """Async variant of get_lakebase_provisioned."""
+        fresh, entry = self._cache_lookup(_LAKEBASE_CACHE_KEY)
+        if fresh:
+            return entry[2]
+        
+        resources = []
+        endpoint_paths = self._lakebase_candidates()
+        found = None
+        not_found = 0
+        for endpoint_path in endpoint_paths:
+            try:
+                response = await self._get_async_client().get(endpoint_path)
+                if response.status_code == 200:
+                    resources = _extract_lakebase(_parse_body(response.content))
+                    found = endpoint_path
+                    break
+                not_found += response.status_code == 404
+            except Exception as e:
+                logger.debug("Endpoint %s not available: %s", endpoint_path, e)
+        self._record_lakebase_probe(found, not_found == len(endpoint_paths))
+        
+        logger.info("Fetched %s Lakebase provisioned resources", len(resources))
+        self._cache_store(_LAKEBASE_CACHE_KEY, None, resources, self.cache_ttl)
+        return resources
+    
+    async def aget_all_compute_resources(self, include: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Async variant of get_all_compute_resources.
+        
+        Every endpoint is requested concurrently on the shared async client,
+        multiplexed over one HTTP/2 connection when h2 is installed.
+        """
+        keys = _compute_keys(include)
+        fetches = {}
+        if _CLUSTER_KEYS.intersection(keys):
+            fetches["clusters"] = self.aget_all_clusters()
+        if "lakebase_provisioned" in keys:
+            fetches["lakebase_provisioned"] = self.aget_lakebase_provisioned()
+        if "ml_jobs" in keys:
+            fetches["ml_jobs"] = self.aget_all_jobs()
+        for key, spec in _ASYNC_LIST_ENDPOINTS.items():
+            if key in keys:
+                fetches[key] = self._alist(*spec)
+        
+        results = dict(zip(fetches, await asyncio.gather(*fetches.values())))
+        if "clusters" in results:
+            results.update(_split_clusters(results.pop("clusters")))
+        if "ml_jobs" in results:
+            results["ml_jobs"] = _filter_ml_jobs(results["ml_jobs"])
+        return {key: results[key] for key in keys}
+    
+    def close(self) -> None:
+        """Stop the fetch threads and close the pooled connections of the sync session."""
+        self._executor.shutdown(wait=False)
+        self.session.close()
+    
+    async def aclose(self) -> None:
+        """Close the async HTTP client; must run on the loop that used it."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
     def get_all_clusters(self) -> List[Dict[str, Any]]:
         """Fetch all clusters from Databricks workspace using REST API.
         
@@ -147,68 +940,57 @@ class DatabricksClient:
         """
         try:
             url = f"{self.host}/api/2.1/clusters/list"
-            logger.info(f"Fetching clusters from: {url}")
-            
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            clusters_data = data.get("clusters", [])
-            logger.info(f"Found {len(clusters_data)} clusters in API response")
+            logger.info("Fetching clusters from: %s", url)
             
-            clusters = []
-            for cluster in clusters_data:
-                try:
-                    # Handle state - can be string or dict
-                    state = cluster.get("state")
-                    if isinstance(state, dict):
-                        state = state.get("cluster_state", "UNKNOWN")
-                    elif state is None:
-                        state = "UNKNOWN"
-                    
-                    cluster_dict = {
-                        "cluster_id": cluster.get("cluster_id"),
-                        "cluster_name": cluster.get("cluster_name") or f"Cluster-{cluster.get('cluster_id')}",
-                        "state": state,
-                        "spark_version": cluster.get("spark_version"),
-                        "node_type_id": cluster.get("node_type_id"),
-                        "driver_node_type_id": cluster.get("driver_node_type_id"),
-                        "num_workers": cluster.get("num_workers", 0),
-                        "autotermination_minutes": cluster.get("autotermination_minutes"),
-                        "enable_elastic_disk": cluster.get("enable_elastic_disk"),
-                        "cluster_source": cluster.get("cluster_source"),
-                        "start_time": cluster.get("start_time"),
-                        "terminated_time": cluster.get("terminated_time"),
-                        "last_activity_time": cluster.get("last_activity_time"),
-                        "cluster_memory_mb": cluster.get("cluster_memory_mb"),
-                        "cluster_cores": cluster.get("cluster_cores"),
-                        "default_tags": cluster.get("default_tags", {}),
-                        "spark_conf": cluster.get("spark_conf", {}),
-                        "autoscale": {
-                            "min_workers": cluster.get("autoscale", {}).get("min_workers"),
-                            "max_workers": cluster.get("autoscale", {}).get("max_workers"),
-                        } if cluster.get("autoscale") else None,
-                    }
-                    clusters.append(cluster_dict)
-                    logger.info(f"Added cluster: {cluster_dict['cluster_name']} (State: {cluster_dict['state']})")
-                
-                except Exception as cluster_error:
-                    logger.warning(f"Error processing cluster {cluster.get('cluster_id')}: {str(cluster_error)}")
-                    # Add basic info even if processing fails
-                    clusters.append({
-                        "cluster_id": cluster.get("cluster_id"),
-                        "cluster_name": cluster.get("cluster_name", f"Cluster-{cluster.get('cluster_id')}"),
-                        "state": cluster.get("state", "UNKNOWN"),
-                        "error": f"Could not process: {str(cluster_error)}"
-                    })
-            
-            logger.info(f"Successfully fetched {len(clusters)} clusters from Databricks")
+            clusters = self._cached_get("/api/2.1/clusters/list", _transform_clusters, _CLUSTERS_LIST_PARAMS, items_key="clusters")
+            logger.info("Successfully fetched %s clusters from Databricks", len(clusters))
             return clusters
         
         except Exception as e:
-            logger.error(f"Error fetching clusters: {str(e)}", exc_info=True)
+            logger.error("Error fetching clusters: %s", e, exc_info=True)
             return []
     
+    def get_all_clusters_columnar(self, clusters: Optional[List[Dict[str, Any]]] = None) -> Dict[str, List[Any]]:
+        """Return get_all_clusters as one list per field, for counts and scans.
+        
+        e.g. ``columns["state"].count("RUNNING")`` counts running clusters
+        in C. The view is rebuilt only when the cluster listing changes.
+        
+        Args:
+            clusters: Cluster listing already fetched by the caller (fetched
+                with get_all_clusters if omitted)
+        
+        Returns:
+            Dictionary mapping each _CLUSTER_COLUMNS field to its values, in
+            cluster order
+        """
+        if clusters is None:
+            clusters = self.get_all_clusters()
+        cached = self._cluster_columns
+        if cached is not None and cached[0] is clusters:
+            return cached[1]
+        columns = _cluster_columns(clusters)
+        self._cluster_columns = (clusters, columns)
+        return columns
+    
+    def iter_clusters(self) -> Iterator[Dict[str, Any]]:
+        """Yield the workspace's clusters lazily, in the shape of get_all_clusters.
+        
+        Raises:
+            requests.HTTPError: If a page request fails
+        """
+        return self._iter_listing("/api/2.1/clusters/list", "clusters", _transform_cluster_or_error, _CLUSTERS_LIST_PARAMS)
+    
+    def get_jobs_and_clusters(self) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Fetch jobs and clusters concurrently.
+        
+        Returns:
+            Tuple of (jobs, clusters)
+        """
+        clusters = self._executor.submit(self.get_all_clusters)
+        jobs = self.get_all_jobs()
+        return jobs, clusters.result()
+    
     def get_cluster_metrics(self, cluster_id: str) -> Dict[str, Any]:
         """Fetch metrics for a specific cluster using REST API.
         
@@ -219,27 +1001,25 @@ class DatabricksClient:
             Dictionary with cluster metrics
         """
         try:
-            url = f"{self.host}/api/2.1/clusters/get"
             params = {"cluster_id": cluster_id}
             
-            response = requests.get(url, headers=self.headers, params=params, timeout=30)
-            response.raise_for_status()
+            def transform(cluster: Dict[str, Any]) -> Dict[str, Any]:
+                state = cluster.get("state")
+                if state.__class__ is dict:
+                    state = state.get("cluster_state")
+                
+                return {
+                    "cluster_id": cluster_id,
+                    "state": state,
+                    "num_workers": cluster.get("num_workers", 0),
+                    "cluster_cores": cluster.get("cluster_cores"),
+                    "cluster_memory_mb": cluster.get("cluster_memory_mb"),
+                }
             
-            cluster = response.json()
-            state = cluster.get("state")
-            if isinstance(state, dict):
-                state = state.get("cluster_state")
-            
-            return {
-                "cluster_id": cluster_id,
-                "state": state,
-                "num_workers": cluster.get("num_workers", 0),
-                "cluster_cores": cluster.get("cluster_cores"),
-                "cluster_memory_mb": cluster.get("cluster_memory_mb"),
-            }
+            return self._cached_get("/api/2.1/clusters/get", transform, params, ttl=self.metrics_cache_ttl)
         
         except Exception as e:
-            logger.error(f"Error fetching metrics for cluster {cluster_id}: {str(e)}")
+            logger.error("Error fetching metrics for cluster %s: %s", cluster_id, e)
             return {}
     
     def get_sql_warehouses(self) -> List[Dict[str, Any]]:
@@ -250,31 +1030,21 @@ class DatabricksClient:
         """
         try:
             url = f"{self.host}/api/2.0/sql/warehouses"
-            logger.info(f"Fetching SQL warehouses from: {url}")
-            
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
+            logger.info("Fetching SQL warehouses from: %s", url)
             
-            data = response.json()
+            warehouses = self._cached_get("/api/2.0/sql/warehouses", _extract_warehouses)
             
-            # Handle different response formats
-            warehouses = []
-            if isinstance(data, list):
-                warehouses = data
-            elif isinstance(data, dict):
-                # Try common keys for warehouse list
-                warehouses = data.get("warehouses", [])
-                if not warehouses:
-                    warehouses = data.get("results", [])
-                if not warehouses and "warehouse_id" in data:
-                    # Single warehouse response
-                    warehouses = [data]
-            
-            logger.info(f"Fetched {len(warehouses)} SQL warehouses")
+            logger.info("Fetched %s SQL warehouses", len(warehouses))
             
             # Log warehouse details for debugging
-            for warehouse in warehouses[:3]:  # Log first 3
-                logger.debug(f"Warehouse: {warehouse.get('name', 'Unknown')} - ID: {warehouse.get('id', warehouse.get('warehouse_id', 'N/A'))} - State: {warehouse.get('state', 'N/A')}")
+            if logger.isEnabledFor(logging.DEBUG):
+                for warehouse in warehouses[:3]:  # Log first 3
+                    logger.debug(
+                        "Warehouse: %s - ID: %s - State: %s",
+                        warehouse.get('name', 'Unknown'),
+                        warehouse.get('id', warehouse.get('warehouse_id', 'N/A')),
+                        warehouse.get('state', 'N/A'),
+                    )
             
             return warehouses
         
@@ -282,10 +1052,10 @@ class DatabricksClient:
             if e.response.status_code == 404:
                 logger.warning("SQL warehouses API endpoint not found. This workspace may not have SQL warehouses enabled.")
             else:
-                logger.error(f"HTTP error fetching SQL warehouses: {e.response.status_code} - {e.response.text}")
+                logger.error("HTTP error fetching SQL warehouses: %s - %s", e.response.status_code, e.response.text)
             return []
         except Exception as e:
-            logger.error(f"Error fetching SQL warehouses: {str(e)}", exc_info=True)
+            logger.error("Error fetching SQL warehouses: %s", e, exc_info=True)
             return []
     
     def get_instance_pools(self) -> List[Dict[str, Any]]:
@@ -296,19 +1066,15 @@ class DatabricksClient:
         """
         try:
             url = f"{self.host}/api/2.0/instance-pools/list"
-            logger.info(f"Fetching instance pools from: {url}")
-            
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
+            logger.info("Fetching instance pools from: %s", url)
             
-            data = response.json()
-            pools = data.get("instance_pools", [])
+            pools = self._cached_get("/api/2.0/instance-pools/list", lambda data: data.get("instance_pools", []))
             
-            logger.info(f"Fetched {len(pools)} instance pools")
+            logger.info("Fetched %s instance pools", len(pools))
             return pools
         
         except Exception as e:
-            logger.error(f"Error fetching instance pools: {str(e)}", exc_info=True)
+            logger.error("Error fetching instance pools: %s", e, exc_info=True)
             return []
     
     def get_vector_search_endpoints(self) -> List[Dict[str, Any]]:
@@ -319,19 +1085,15 @@ class DatabricksClient:
         """
         try:
             url = f"{self.host}/api/2.0/vector-search/endpoints"
-            logger.info(f"Fetching Vector Search endpoints from: {url}")
+            logger.info("Fetching Vector Search endpoints from: %s", url)
             
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
+            endpoints = self._cached_get("/api/2.0/vector-search/endpoints", lambda data: data.get("endpoints", []), items_key="endpoints")
             
-            data = response.json()
-            endpoints = data.get("endpoints", [])
-            
-            logger.info(f"Fetched {len(endpoints)} Vector Search endpoints")
+            logger.info("Fetched %s Vector Search endpoints", len(endpoints))
             return endpoints
         
         except Exception as e:
-            logger.error(f"Error fetching Vector Search endpoints: {str(e)}", exc_info=True)
+            logger.error("Error fetching Vector Search endpoints: %s", e, exc_info=True)
             return []
     
     def get_cluster_policies(self) -> List[Dict[str, Any]]:
@@ -342,19 +1104,15 @@ class DatabricksClient:
         """
         try:
             url = f"{self.host}/api/2.1/policies/clusters/list"
-            logger.info(f"Fetching cluster policies from: {url}")
-            
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
+            logger.info("Fetching cluster policies from: %s", url)
             
-            data = response.json()
-            policies = data.get("policies", [])
+            policies = self._cached_get("/api/2.1/policies/clusters/list", lambda data: data.get("policies", []))
             
-            logger.info(f"Fetched {len(policies)} cluster policies")
+            logger.info("Fetched %s cluster policies", len(policies))
             return policies
         
         except Exception as e:
-            logger.error(f"Error fetching cluster policies: {str(e)}", exc_info=True)
+            logger.error("Error fetching cluster policies: %s", e, exc_info=True)
             return []
     
     def get_apps(self) -> List[Dict[str, Any]]:
@@ -365,19 +1123,15 @@ class DatabricksClient:
         """
         try:
             url = f"{self.host}/api/2.0/apps/list"
-            logger.info(f"Fetching apps from: {url}")
+            logger.info("Fetching apps from: %s", url)
             
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            apps = data.get("apps", [])
+            apps = self._cached_get("/api/2.0/apps/list", lambda data: data.get("apps", []), items_key="apps")
             
-            logger.info(f"Fetched {len(apps)} apps")
+            logger.info("Fetched %s apps", len(apps))
             return apps
         
         except Exception as e:
-            logger.error(f"Error fetching apps: {str(e)}", exc_info=True)
+            logger.error("Error fetching apps: %s", e, exc_info=True)
             # Apps API might not be available in all workspaces
             logger.warning("Apps API may not be available in this workspace")
             return []
@@ -389,42 +1143,37 @@ class DatabricksClient:
             List of Lakebase provisioned resource dictionaries
         """
         try:
-            # Lakebase might be under Unity Catalog or a different endpoint
-            # Try multiple possible endpoints
-            endpoints_to_try = [
-                "/api/2.1/unity-catalog/storage-credentials",
-                "/api/2.1/unity-catalog/external-locations",
-                "/api/2.0/lakebase/provisioned",
-            ]
+            fresh, entry = self._cache_lookup(_LAKEBASE_CACHE_KEY)
+            if fresh:
+                return entry[2]
             
             all_resources = []
-            for endpoint_path in endpoints_to_try:
+            endpoint_paths = self._lakebase_candidates()
+            found = None
+            not_found = 0
+            for endpoint_path in endpoint_paths:
                 try:
                     url = f"{self.host}{endpoint_path}"
-                    logger.info(f"Trying to fetch Lakebase resources from: {url}")
+                    logger.info("Trying to fetch Lakebase resources from: %s", url)
                     
-                    response = requests.get(url, headers=self.headers, timeout=30)
+                    response = self.session.get(url, timeout=30)
                     if response.status_code == 200:
-                        data = response.json()
-                        # Handle different response formats
-                        if isinstance(data, list):
-                            all_resources.extend(data)
-                        elif isinstance(data, dict):
-                            # Try common keys
-                            for key in ["storage_credentials", "external_locations", "resources", "items"]:
-                                if key in data:
-                                    all_resources.extend(data[key] if isinstance(data[key], list) else [data[key]])
-                        logger.info(f"Found {len(all_resources)} Lakebase resources from {endpoint_path}")
+                        all_resources.extend(_extract_lakebase(_parse_body(response.content)))
+                        logger.info("Found %s Lakebase resources from %s", len(all_resources), endpoint_path)
+                        found = endpoint_path
                         break  # Success, no need to try other endpoints
+                    not_found += response.status_code == 404
                 except Exception as e:
-                    logger.debug(f"Endpoint {endpoint_path} not available: {str(e)}")
+                    logger.debug("Endpoint %s not available: %s", endpoint_path, e)
                     continue
+            self._record_lakebase_probe(found, not_found == len(endpoint_paths))
             
-            logger.info(f"Fetched {len(all_resources)} Lakebase provisioned resources")
+            logger.info("Fetched %s Lakebase provisioned resources", len(all_resources))
+            self._cache_store(_LAKEBASE_CACHE_KEY, None, all_resources, self.cache_ttl)
             return all_resources
         
         except Exception as e:
-            logger.error(f"Error fetching Lakebase provisioned resources: {str(e)}", exc_info=True)
+            logger.error("Error fetching Lakebase provisioned resources: %s", e, exc_info=True)
             return []
     
     def get_mlflow_experiments(self) -> List[Dict[str, Any]]:
@@ -435,25 +1184,21 @@ class DatabricksClient:
         """
         try:
             url = f"{self.host}/api/2.0/mlflow/experiments/search"
-            logger.info(f"Fetching MLflow experiments from: {url}")
-            
-            response = requests.post(url, headers=self.headers, json={}, timeout=30)
-            response.raise_for_status()
+            logger.info("Fetching MLflow experiments from: %s", url)
             
-            data = response.json()
-            experiments = data.get("experiments", [])
+            experiments = self._cached_get("/api/2.0/mlflow/experiments/search", lambda data: data.get("experiments", []), _MLFLOW_SEARCH_PARAMS, method="POST", items_key="experiments")
             
-            logger.info(f"Fetched {len(experiments)} MLflow experiments")
+            logger.info("Fetched %s MLflow experiments", len(experiments))
             return experiments
         
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 logger.warning("MLflow experiments API endpoint not found. MLflow may not be enabled.")
             else:
-                logger.error(f"HTTP error fetching MLflow experiments: {e.response.status_code}")
+                logger.error("HTTP error fetching MLflow experiments: %s", e.response.status_code)
             return []
         except Exception as e:
-            logger.error(f"Error fetching MLflow experiments: {str(e)}", exc_info=True)
+            logger.error("Error fetching MLflow experiments: %s", e, exc_info=True)
             return []
     
     def get_mlflow_models(self) -> List[Dict[str, Any]]:
@@ -464,25 +1209,21 @@ class DatabricksClient:
         """
         try:
             url = f"{self.host}/api/2.0/mlflow/registered-models/search"
-            logger.info(f"Fetching MLflow models from: {url}")
+            logger.info("Fetching MLflow models from: %s", url)
             
-            response = requests.post(url, headers=self.headers, json={}, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            models = data.get("registered_models", [])
+            models = self._cached_get("/api/2.0/mlflow/registered-models/search", lambda data: data.get("registered_models", []), _MLFLOW_SEARCH_PARAMS, method="POST", items_key="registered_models")
             
-            logger.info(f"Fetched {len(models)} MLflow models")
+            logger.info("Fetched %s MLflow models", len(models))
             return models
         
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 logger.warning("MLflow models API endpoint not found. MLflow may not be enabled.")
             else:
-                logger.error(f"HTTP error fetching MLflow models: {e.response.status_code}")
+                logger.error("HTTP error fetching MLflow models: %s", e.response.status_code)
             return []
         except Exception as e:
-            logger.error(f"Error fetching MLflow models: {str(e)}", exc_info=True)
+            logger.error("Error fetching MLflow models: %s", e, exc_info=True)
             return []
     
     def get_model_serving_endpoints(self) -> List[Dict[str, Any]]:
@@ -493,25 +1234,21 @@ class DatabricksClient:
         """
         try:
             url = f"{self.host}/api/2.0/serving-endpoints"
-            logger.info(f"Fetching model serving endpoints from: {url}")
+            logger.info("Fetching model serving endpoints from: %s", url)
             
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
+            endpoints = self._cached_get("/api/2.0/serving-endpoints", lambda data: data.get("endpoints", []))
             
-            data = response.json()
-            endpoints = data.get("endpoints", [])
-            
-            logger.info(f"Fetched {len(endpoints)} model serving endpoints")
+            logger.info("Fetched %s model serving endpoints", len(endpoints))
             return endpoints
         
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 logger.warning("Model serving endpoints API not found. Model serving may not be enabled.")
             else:
-                logger.error(f"HTTP error fetching model serving endpoints: {e.response.status_code}")
+                logger.error("HTTP error fetching model serving endpoints: %s", e.response.status_code)
             return []
         except Exception as e:
-            logger.error(f"Error fetching model serving endpoints: {str(e)}", exc_info=True)
+            logger.error("Error fetching model serving endpoints: %s", e, exc_info=True)
             return []
     
     def get_feature_store_tables(self) -> List[Dict[str, Any]]:
@@ -523,25 +1260,21 @@ class DatabricksClient:
         try:
             # Feature Store API endpoint
             url = f"{self.host}/api/2.0/feature-store/feature-tables/search"
-            logger.info(f"Fetching feature store tables from: {url}")
-            
-            response = requests.post(url, headers=self.headers, json={}, timeout=30)
-            response.raise_for_status()
+            logger.info("Fetching feature store tables from: %s", url)
             
-            data = response.json()
-            tables = data.get("feature_tables", [])
+            tables = self._cached_get("/api/2.0/feature-store/feature-tables/search", lambda data: data.get("feature_tables", []), _FEATURE_TABLES_SEARCH_PARAMS, method="POST", items_key="feature_tables")
             
-            logger.info(f"Fetched {len(tables)} feature store tables")
+            logger.info("Fetched %s feature store tables", len(tables))
             return tables
         
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
                 logger.warning("Feature store API endpoint not found. Feature Store may not be enabled.")
             else:
-                logger.error(f"HTTP error fetching feature store tables: {e.response.status_code}")
+                logger.error("HTTP error fetching feature store tables: %s", e.response.status_code)
             return []
         except Exception as e:
-            logger.error(f"Error fetching feature store tables: {str(e)}", exc_info=True)
+            logger.error("Error fetching feature store tables: %s", e, exc_info=True)
             return []
     
     def get_ml_jobs(self) -> List[Dict[str, Any]]:
@@ -551,67 +1284,63 @@ class DatabricksClient:
             List of ML/AI job dictionaries (filtered from all jobs)
         """
         try:
+            # Shares get_all_jobs' cached listing, so polls within the cache
+            # TTL do not page through jobs/list again
             all_jobs = self.get_all_jobs()
+            ml_jobs = _filter_ml_jobs(all_jobs)
             
-            # Filter jobs that are likely ML/AI jobs
-            ml_jobs = []
-            ml_keywords = ['ml', 'machine learning', 'model', 'training', 'inference', 'mlflow', 
-                          'pytorch', 'tensorflow', 'xgboost', 'sklearn', 'spark ml', 'pipeline']
-            
-            for job in all_jobs:
-                job_name = job.get("job_name", "").lower()
-                job_settings = job.get("settings", {})
-                tasks = job_settings.get("tasks", [])
-                
-                # Check if job name contains ML keywords
-                is_ml_job = any(keyword in job_name for keyword in ml_keywords)
-                
-                # Check task configurations for ML libraries
-                if not is_ml_job:
-                    for task in tasks:
-                        task_key = task.get("task_key", "").lower()
-                        notebook_path = task.get("notebook_task", {}).get("notebook_path", "").lower()
-                        spark_python_task = task.get("spark_python_task", {})
-                        python_file = spark_python_task.get("python_file", "").lower()
-                        
-                        if (any(keyword in task_key for keyword in ml_keywords) or
-                            any(keyword in notebook_path for keyword in ml_keywords) or
-                            any(keyword in python_file for keyword in ml_keywords)):
-                            is_ml_job = True
-                            break
-                
-                if is_ml_job:
-                    ml_jobs.append({
-                        **job,
-                        "ml_category": "ML/AI Job",
-                        "detected_by": "keyword_match"
-                    })
-            
-            logger.info(f"Identified {len(ml_jobs)} ML/AI jobs out of {len(all_jobs)} total jobs")
+            logger.info("Identified %s ML/AI jobs out of %s total jobs", len(ml_jobs), len(all_jobs))
             return ml_jobs
         
         except Exception as e:
-            logger.error(f"Error identifying ML jobs: {str(e)}", exc_info=True)
+            logger.error("Error identifying ML jobs: %s", e, exc_info=True)
             return []
     
-    def get_all_compute_resources(self) -> Dict[str, Any]:
+    def get_all_compute_resources(self, include: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """Fetch all compute resources from Databricks workspace.
         
+        The independent list endpoints are fetched concurrently, so the call
+        takes about as long as the slowest endpoint rather than their sum.
+        Clusters are fetched once and split by ``cluster_source``.
+        
+        Args:
+            include: Resource keys to fetch (e.g. {"all_purpose_clusters",
+                "sql_warehouses"}); endpoints of other keys are not requested.
+                All keys if omitted
+        
         Returns:
-            Dictionary containing all compute resource types
+            Dictionary containing the requested compute resource types
         """
-        return {
-            "all_purpose_clusters": self.get_all_clusters(),
-            "job_clusters": self.get_all_clusters(),  # Job clusters are also in clusters list
-            "sql_warehouses": self.get_sql_warehouses(),
-            "vector_search": self.get_vector_search_endpoints(),
-            "pools": self.get_instance_pools(),
-            "policies": self.get_cluster_policies(),
-            "apps": self.get_apps(),
-            "lakebase_provisioned": self.get_lakebase_provisioned(),
-            "ml_jobs": self.get_ml_jobs(),
-            "mlflow_experiments": self.get_mlflow_experiments(),
-            "mlflow_models": self.get_mlflow_models(),
-            "model_serving_endpoints": self.get_model_serving_endpoints(),
-            "feature_store_tables": self.get_feature_store_tables(),
+        keys = _compute_keys(include)
+        needed = set(keys)
+        if _CLUSTER_KEYS & needed:
+            needed.add("clusters")
+        fetchers = {
+            "clusters": self.get_all_clusters,
+            "sql_warehouses": self.get_sql_warehouses,
+            "vector_search": self.get_vector_search_endpoints,
+            "pools": self.get_instance_pools,
+            "policies": self.get_cluster_policies,
+            "apps": self.get_apps,
+            "lakebase_provisioned": self.get_lakebase_provisioned,
+            "ml_jobs": self.get_ml_jobs,
+            "mlflow_experiments": self.get_mlflow_experiments,
+            "mlflow_models": self.get_mlflow_models,
+            "model_serving_endpoints": self.get_model_serving_endpoints,
+            "feature_store_tables": self.get_feature_store_tables,
         }
+        fetchers = {key: fetch for key, fetch in fetchers.items() if key in needed}
+        
+        results: Dict[str, Any] = {}
+        futures = {self._executor.submit(fetch): key for key, fetch in fetchers.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                logger.error("Error fetching %s: %s", key, e, exc_info=True)
+                results[key] = []
+        
+        if "clusters" in results:
+            results.update(_split_clusters(results.pop("clusters")))
+        return {key: results[key] for key in keys}
@@ -0,0 +1,18 @@
+"""Gunicorn settings for serving the Flask app (main.py).
+
+Run from the backend directory with ``gunicorn main:app``.
+"""
+from config import settings
+
+bind = f"0.0.0.0:{settings.backend_port}"
+
+# A single worker process: analysis results are cached in process memory, so
+# every request has to reach the process that ran the analysis. Its threads
+# overlap the Databricks and LLM I/O of concurrent requests. gevent is not
+# used since main.py runs its async client on a background event loop thread.
+workers = 1
+worker_class = "gthread"
+threads = 32
+
+# An AI analysis waits on Databricks and the LLM well past the 30s default
+timeout = 300
@@ -1,56 +1,232 @@
 """Flask backend for ClusterIQ using direct HTTP requests."""
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Callable, Iterator, Hashable, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future
+import asyncio
 import logging
-from datetime import datetime
+import orjson
+import threading
+import time
+from datetime import datetime, timezone
 
 from config import settings
 from databricks_client import DatabricksClient
-from ai_agent import ClusterIQAgent
+from basic_analysis import parse_estimated_savings, perform_basic_analysis
+from compression import choose_encoding, compress_body
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson for faster response encoding."""
+    
+    # orjson output is always compact; indentation is never applied
+    compact = True
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Build a jsonify response from orjson's bytes, skipping the str round trip."""
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+# Encoded JSON bodies of cached results: key -> (result, body). The client
+# returns the same object while its TTL cache entry is fresh, and
+# analysis_cache is only ever replaced, so a request served that object again
+# reuses the body instead of re-encoding it.
+_ENCODED_BODIES_SIZE = 64
+_encoded_bodies: "OrderedDict[Hashable, Tuple[Any, bytes]]" = OrderedDict()
+_encoded_bodies_lock = threading.Lock()
+
+# /api/stats counts and the job listing and columnar cluster view they were
+# computed from; both are the same objects while the client cache is fresh
+_stats_counts: Tuple[Any, Any, Optional[Dict[str, int]]] = (None, None, None)
+
+# Clusters encoded per chunk of the streamed /api/debug/clusters body
+_DEBUG_CLUSTERS_BATCH = 100
+
+
+def _cached_json_response(
+    key: Hashable,
+    result: Any,
+    build: Optional[Callable[[Any], Any]] = None
+) -> Response:
+    """jsonify a cached result, reusing its encoded body while it is unchanged.
+    
+    Args:
+        key: Name of the body in the memo
+        result: Cached object the body is derived from; compared by identity
+        build: Builds the payload from result (result itself if omitted)
+    """
+    with _encoded_bodies_lock:
+        entry = _encoded_bodies.get(key)
+        if entry is not None:
+            _encoded_bodies.move_to_end(key)
+    if entry is None or entry[0] is not result:
+        payload = result if build is None else build(result)
+        entry = (result, orjson.dumps(payload, default=app.json.default, option=orjson.OPT_NON_STR_KEYS))
+        with _encoded_bodies_lock:
+            _encoded_bodies[key] = entry
+            while len(_encoded_bodies) > _ENCODED_BODIES_SIZE:
+                _encoded_bodies.popitem(last=False)
+    return app.response_class(entry[1], mimetype=app.json.mimetype)
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format a server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {orjson.dumps(data, default=str).decode('utf-8')}\n\n"
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app, origins=settings.cors_origins)
 
-# Initialize clients
-databricks_client = None
-ai_agent = None
-
-# Cache for analysis results
+# Clients are created on first use (see get_databricks_client and
+# get_ai_agent) rather than at import, so the app serves /health without
+# waiting for the Databricks and LLM clients
+_databricks_client: Optional[DatabricksClient] = None
+_databricks_client_ready = False
+_ai_agent: Optional[Any] = None
+_ai_agent_ready = False
+_databricks_client_lock = threading.Lock()
+_ai_agent_lock = threading.Lock()
+
+# Cache for analysis results. An analysis replaces the dict wholesale and
+# never mutates it in place, so a handler that takes one reference to it sees
+# a single consistent analysis, timestamp included.
 analysis_cache = {}
-cache_timestamp = None
 
+# /api/analyze run in progress, if any; concurrent requests wait on it
+_analysis_inflight: Optional[Future] = None
+_analysis_inflight_lock = threading.Lock()
+
+# Encoded /api/summary body and the analysis_cache it summarizes; the cache is
+# replaced, never mutated, so its identity tells whether the body is current
+_summary_body: Tuple[Any, Optional[bytes]] = (None, None)
+
+# Background event loop for the agent's async APIs. A single long-lived loop
+# keeps the agent's pooled async HTTP connections usable across requests.
+_event_loop = asyncio.new_event_loop()
+threading.Thread(target=_event_loop.run_forever, name="agent-event-loop", daemon=True).start()
+
+
+# Response timestamps are re-formatted at most every _NOW_ISO_INTERVAL
+# seconds; polled endpoints share the string within that window
+_NOW_ISO_INTERVAL = 0.1
+_now_iso_cache: Tuple[float, str] = (float("-inf"), "")
 
-# Initialize clients on startup
-try:
-    if settings.databricks_host and settings.databricks_token:
-        databricks_client = DatabricksClient(
-            host=settings.databricks_host,
-            token=settings.databricks_token
-        )
-        logger.info("Databricks client initialized")
-    
-    if settings.azure_openai_endpoint and settings.azure_openai_api_key and settings.azure_openai_deployment_name:
-        ai_agent = ClusterIQAgent(
-            azure_endpoint=settings.azure_openai_endpoint,
-            azure_api_key=settings.azure_openai_api_key,
-            azure_deployment_name=settings.azure_openai_deployment_name,
-            model=settings.openai_model
-        )
-        logger.info("AI agent initialized with Azure OpenAI")
-    elif settings.openai_api_key:
-        ai_agent = ClusterIQAgent(
-            api_key=settings.openai_api_key,
-            model=settings.openai_model
-        )
-        logger.info("AI agent initialized")
-except Exception as e:
-    logger.error(f"Error during startup: {str(e)}")
+
+def _now_iso() -> str:
+    """Return the current UTC time as an ISO 8601 string, at ~100ms granularity."""
+    global _now_iso_cache
+    checked_at, formatted = _now_iso_cache
+    now = time.monotonic()
+    if now - checked_at >= _NOW_ISO_INTERVAL:
+        formatted = datetime.now(timezone.utc).isoformat()
+        _now_iso_cache = (now, formatted)
+    return formatted
+
+
+def _run_async(coroutine: Any) -> Any:
+    """Run a coroutine on the background event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coroutine, _event_loop).result()
+
+
+def _iterate_async(iterator: AsyncIterator[Any]) -> Iterator[Any]:
+    """Iterate an async iterator from sync code via the background event loop."""
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(iterator.__anext__(), _event_loop).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        asyncio.run_coroutine_threadsafe(iterator.aclose(), _event_loop).result()
+
+
+def get_databricks_client() -> Optional[DatabricksClient]:
+    """Return the shared Databricks client, creating it on first use.
+    
+    Returns:
+        The client, or None when Databricks is not configured or the client
+        could not be created
+    """
+    global _databricks_client, _databricks_client_ready
+    if not _databricks_client_ready:
+        with _databricks_client_lock:
+            if not _databricks_client_ready:
+                try:
+                    if settings.databricks_host and settings.databricks_token:
+                        _databricks_client = DatabricksClient(
+                            host=settings.databricks_host,
+                            token=settings.databricks_token,
+                            cache_ttl=settings.update_interval
+                        )
+                        logger.info("Databricks client initialized")
+                except Exception as e:
+                    logger.error("Error initializing Databricks client: %s", e)
+                _databricks_client_ready = True
+    return _databricks_client
+
+
+def get_ai_agent() -> Optional[Any]:
+    """Return the shared AI agent, creating it on first use.
+    
+    The agent module (and langchain with it) is imported here rather than at
+    startup.
+    
+    Returns:
+        The agent, or None when no LLM provider is configured or the agent
+        could not be created
+    """
+    global _ai_agent, _ai_agent_ready
+    if not _ai_agent_ready:
+        with _ai_agent_lock:
+            if not _ai_agent_ready:
+                try:
+                    from ai_agent import get_agent
+                    _ai_agent = get_agent()
+                    if _ai_agent:
+                        logger.info("AI agent initialized")
+                except Exception as e:
+                    logger.error("Error initializing AI agent: %s", e)
+                _ai_agent_ready = True
+    return _ai_agent
+
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    """Compress JSON responses for clients that accept brotli or gzip.
+    
+    Streamed responses (the SSE analysis and /api/debug/clusters) are sent
+    as is.
+    """
+    if (
+        response.mimetype != app.json.mimetype
+        or response.is_streamed
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    body = response.get_data()
+    encoding = choose_encoding(request.headers.get("Accept-Encoding", ""), len(body))
+    if encoding:
+        response.set_data(compress_body(body, encoding))
+        response.headers["Content-Encoding"] = encoding
+    return response
 
 
 @app.route("/")
@@ -68,60 +244,69 @@ def health_check():
     """Health check endpoint."""
     return jsonify({
         "status": "healthy",
-        "databricks_configured": databricks_client is not None,
-        "ai_configured": ai_agent is not None,
-        "timestamp": datetime.utcnow().isoformat()
+        # From settings, so health checks never wait on client creation
+        "databricks_configured": bool(settings.databricks_host and settings.databricks_token),
+        "ai_configured": bool(
+            settings.openai_api_key
+            or (settings.azure_openai_endpoint and settings.azure_openai_api_key
+                and settings.azure_openai_deployment_name)
+        ),
+        "timestamp": _now_iso()
     })
 
 
 @app.route("/api/jobs", methods=["GET"])
 def get_jobs():
     """Fetch all Databricks jobs."""
+    databricks_client = get_databricks_client()
     if not databricks_client:
         return jsonify({"error": "Databricks client not configured"}), 503
     
     try:
         jobs = databricks_client.get_all_jobs()
-        return jsonify(jobs)
+        return _cached_json_response("jobs", jobs)
     except Exception as e:
-        logger.error(f"Error fetching jobs: {str(e)}")
+        logger.error("Error fetching jobs: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
 @app.route("/api/jobs/<int:job_id>/runs", methods=["GET"])
 def get_job_runs(job_id):
     """Fetch runs for a specific job."""
+    databricks_client = get_databricks_client()
     if not databricks_client:
         return jsonify({"error": "Databricks client not configured"}), 503
     
     try:
         limit = request.args.get("limit", 50, type=int)
         runs = databricks_client.get_job_runs(job_id=job_id, limit=limit)
-        return jsonify(runs)
+        return _cached_json_response(("runs", job_id, limit), runs)
     except Exception as e:
-        logger.error(f"Error fetching job runs: {str(e)}")
+        logger.error("Error fetching job runs: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
 @app.route("/api/clusters", methods=["GET"])
 def get_clusters():
     """Fetch all Databricks clusters."""
+    databricks_client = get_databricks_client()
     if not databricks_client:
         return jsonify({"error": "Databricks client not configured"}), 503
     
     try:
         logger.info("API: Fetching clusters...")
         clusters = databricks_client.get_all_clusters()
-        logger.info(f"API: Returning {len(clusters)} clusters")
-        return jsonify(clusters)
+        logger.info("API: Returning %s clusters", len(clusters))
+        return _cached_json_response("clusters", clusters)
     except Exception as e:
-        logger.error(f"Error fetching clusters: {str(e)}", exc_info=True)
+        logger.error("Error fetching clusters: %s", e, exc_info=True)
         return jsonify([{"error": str(e), "message": "Failed to fetch clusters"}]), 500
 
 
 @app.route("/api/clusters/<cluster_id>/metrics", methods=["GET"])
 def get_cluster_metrics(cluster_id):
     """Fetch metrics for a specific cluster."""
+    databricks_client = get_databricks_client()
     if not databricks_client:
         return jsonify({"error": "Databricks client not configured"}), 503
     
@@ -129,184 +314,300 @@ def get_cluster_metrics(cluster_id):
         metrics = databricks_client.get_cluster_metrics(cluster_id)
         return jsonify(metrics)
     except Exception as e:
-        logger.error(f"Error fetching cluster metrics: {str(e)}")
+        logger.error("Error fetching cluster metrics: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/compute", methods=["GET"])
+def get_all_compute():
+    """Fetch every compute resource type, with all endpoints requested concurrently.
+    
+    ``?include=all_purpose_clusters,sql_warehouses`` limits the response (and the
+    requests made) to the listed resource types.
+    """
+    databricks_client = get_databricks_client()
+    if not databricks_client:
+        return jsonify({"error": "Databricks client not configured"}), 503
+    
+    include = request.args.get("include")
+    try:
+        return jsonify(_run_async(databricks_client.aget_all_compute_resources(
+            include.split(",") if include else None
+        )))
+    except Exception as e:
+        logger.error("Error fetching compute resources: %s", e, exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
+
+def _run_analysis() -> Dict[str, Any]:
+    """Fetch jobs and clusters, analyze them and store the result in analysis_cache.
+    
+    Returns:
+        The /api/analyze response payload
+    """
+    databricks_client = get_databricks_client()
+    ai_agent = get_ai_agent()
+    
+    # Fetch data; jobs, clusters and (for AI analysis) the recent runs of
+    # the first 10 jobs are requested concurrently
+    logger.info("Fetching jobs and clusters...")
+    jobs, clusters, job_runs = _run_async(
+        databricks_client.afetch_jobs_and_clusters(runs_for_jobs=10 if ai_agent else 0, runs_limit=10)
+    )
+    logger.info("Fetched: %s jobs, %s clusters", len(jobs), len(clusters))
+    
+    recommendations = []
+    analysis_type = "rule-based"
+    
+    # Always start with rule-based analysis
+    logger.info("Performing rule-based analysis on clusters and jobs...")
+    try:
+        basic_recommendations = perform_basic_analysis(jobs, clusters)
+        recommendations.extend(basic_recommendations)
+        logger.info("Rule-based analysis generated %s recommendations", len(basic_recommendations))
+    except Exception as basic_error:
+        logger.error("Error in rule-based analysis: %s", basic_error)
+        # Create basic recommendations manually if rule-based analysis fails
+        for cluster in clusters:
+            if cluster.get("state") == "RUNNING":
+                recommendations.append({
+                    "id": f"rec_{len(recommendations)}",
+                    "type": "cost_leak",
+                    "severity": "medium",
+                    "title": f"Running cluster: {cluster.get('cluster_name', 'Unknown')}",
+                    "description": f"Cluster is running. Monitor for idle time and consider auto-termination if not actively used.",
+                    "resource_type": "cluster",
+                    "resource_id": cluster.get("cluster_id"),
+                    "estimated_savings": "Medium - depends on idle time",
+                    "risk": "Low",
+                })
+        for job in jobs:
+            if len(job.get("settings", {}).get("tasks", [])) == 0:
+                recommendations.append({
+                    "id": f"rec_{len(recommendations)}",
+                    "type": "optimization",
+                    "severity": "low",
+                    "title": f"Job with no tasks: {job.get('job_name', 'Unknown')}",
+                    "description": "Job has no configured tasks. Consider reviewing job configuration.",
+                    "resource_type": "job",
+                    "resource_id": job.get("job_id"),
+                    "estimated_savings": "N/A",
+                    "risk": "Low",
+                })
+    
+    # Try AI analysis if available (enhances the recommendations)
+    if ai_agent:
+        try:
+            logger.info("Attempting AI-enhanced analysis...")
+            # Perform AI analysis
+            ai_recommendations = ai_agent.analyze_jobs_and_clusters(
+                jobs=jobs,
+                clusters=clusters,
+                job_runs=job_runs
+            )
+            
+            # If AI analysis succeeds and returns recommendations, use it
+            if ai_recommendations and len(ai_recommendations) > 0:
+                recommendations = ai_recommendations
+                analysis_type = "ai"
+                logger.info("AI analysis completed: %s recommendations", len(recommendations))
+            else:
+                logger.info("AI analysis returned no recommendations, using rule-based results")
+        except Exception as ai_error:
+            logger.warning("AI analysis failed, using rule-based results: %s", ai_error)
+            # Continue with rule-based recommendations
+    else:
+        logger.info("AI agent not available, using rule-based analysis")
+    
+    # Ensure we have at least some recommendations
+    if not recommendations:
+        recommendations = [{
+            "id": "rec_no_data",
+            "type": "info",
+            "severity": "low",
+            "title": "Analysis Complete",
+            "description": f"Analyzed {len(jobs)} jobs and {len(clusters)} clusters. No immediate optimization opportunities detected.",
+            "estimated_savings": "Continue monitoring",
+            "risk": "None",
+        }]
+    
+    # Update cache
+    global analysis_cache
+    cache_timestamp = datetime.now(timezone.utc)
+    analysis_cache = {
+        "recommendations": recommendations,
+        "jobs_count": len(jobs),
+        "clusters_count": len(clusters),
+        "timestamp": cache_timestamp.isoformat(),
+        "analysis_type": analysis_type
+    }
+    
+    return {
+        "recommendations": recommendations,
+        "summary": {
+            "total_jobs": len(jobs),
+            "total_clusters": len(clusters),
+            "recommendations_count": len(recommendations),
+            "analysis_type": analysis_type,
+            "timestamp": cache_timestamp.isoformat()
+        }
+    }
+
+
 @app.route("/api/analyze", methods=["POST"])
 def analyze_jobs_and_clusters():
-    """Analyze jobs and clusters to identify cost leaks."""
+    """Analyze jobs and clusters to identify cost leaks.
+    
+    Requests that arrive while an analysis is running wait for it and share
+    its result rather than starting another fetch and LLM analysis.
+    """
+    global _analysis_inflight
+    if not get_databricks_client():
+        return jsonify({"error": "Databricks client not configured"}), 503
+    
+    with _analysis_inflight_lock:
+        future = _analysis_inflight
+        leader = future is None
+        if leader:
+            future = _analysis_inflight = Future()
+    
+    if leader:
+        try:
+            future.set_result(_run_analysis())
+        except Exception as e:
+            logger.error("Error in analysis: %s", e, exc_info=True)
+            future.set_exception(e)
+        finally:
+            with _analysis_inflight_lock:
+                _analysis_inflight = None
+    else:
+        logger.info("Analysis already in progress, waiting for its result")
+    
+    try:
+        return jsonify(future.result())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/analyze/stream", methods=["GET"])
+def analyze_jobs_and_clusters_stream():
+    """Stream AI recommendations as server-sent events while they are generated.
+    
+    Emits one ``recommendation`` event per recommendation and a final ``done``
+    event with the summary; the complete result is cached like /api/analyze.
+    """
+    databricks_client = get_databricks_client()
     if not databricks_client:
         return jsonify({"error": "Databricks client not configured"}), 503
+    ai_agent = get_ai_agent()
+    if not ai_agent:
+        return jsonify({"error": "AI agent not configured"}), 503
     
     try:
-        # Fetch data
-        logger.info("Fetching jobs and clusters...")
-        jobs = databricks_client.get_all_jobs()
-        clusters = databricks_client.get_all_clusters()
-        logger.info(f"Fetched: {len(jobs)} jobs, {len(clusters)} clusters")
-        
+        jobs, clusters, job_runs = _run_async(
+            databricks_client.afetch_jobs_and_clusters(runs_for_jobs=10, runs_limit=10)
+        )
+    except Exception as e:
+        logger.error("Error fetching data for streaming analysis: %s", e, exc_info=True)
+        return jsonify({"error": str(e)}), 500
+    
+    def generate():
+        global analysis_cache
         recommendations = []
-        analysis_type = "rule-based"
-        
-        # Always start with rule-based analysis
-        logger.info("Performing rule-based analysis on clusters and jobs...")
+        outcome = {"analysis_type": "rule-based"}
         try:
-            # Import the basic analysis function
-            import sys
-            import os
-            sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-            from simple_server import perform_basic_analysis
-            
-            basic_recommendations = perform_basic_analysis(jobs, clusters)
-            recommendations.extend(basic_recommendations)
-            logger.info(f"Rule-based analysis generated {len(basic_recommendations)} recommendations")
-        except Exception as basic_error:
-            logger.error(f"Error in rule-based analysis: {str(basic_error)}")
-            # Create basic recommendations manually if import fails
-            for cluster in clusters:
-                if cluster.get("state") == "RUNNING":
-                    recommendations.append({
-                        "id": f"rec_{len(recommendations)}",
-                        "type": "cost_leak",
-                        "severity": "medium",
-                        "title": f"Running cluster: {cluster.get('cluster_name', 'Unknown')}",
-                        "description": f"Cluster is running. Monitor for idle time and consider auto-termination if not actively used.",
-                        "resource_type": "cluster",
-                        "resource_id": cluster.get("cluster_id"),
-                        "estimated_savings": "Medium - depends on idle time",
-                        "risk": "Low",
-                    })
-            for job in jobs:
-                if len(job.get("settings", {}).get("tasks", [])) == 0:
-                    recommendations.append({
-                        "id": f"rec_{len(recommendations)}",
-                        "type": "optimization",
-                        "severity": "low",
-                        "title": f"Job with no tasks: {job.get('job_name', 'Unknown')}",
-                        "description": "Job has no configured tasks. Consider reviewing job configuration.",
-                        "resource_type": "job",
-                        "resource_id": job.get("job_id"),
-                        "estimated_savings": "N/A",
-                        "risk": "Low",
-                    })
-        
-        # Try AI analysis if available (enhances the recommendations)
-        if ai_agent:
-            try:
-                logger.info("Attempting AI-enhanced analysis...")
-                # Fetch runs for each job (limit to recent runs)
-                job_runs = {}
-                for job in jobs[:10]:  # Limit to first 10 jobs for performance
-                    job_id = job.get("job_id")
-                    if job_id:
-                        try:
-                            runs = databricks_client.get_job_runs(job_id=job_id, limit=10)
-                            job_runs[job_id] = runs
-                        except Exception as run_error:
-                            logger.warning(f"Could not fetch runs for job {job_id}: {str(run_error)}")
-                
-                # Perform AI analysis
-                ai_recommendations = ai_agent.analyze_jobs_and_clusters(
-                    jobs=jobs,
-                    clusters=clusters,
-                    job_runs=job_runs
-                )
-                
-                # If AI analysis succeeds and returns recommendations, use it
-                if ai_recommendations and len(ai_recommendations) > 0:
-                    recommendations = ai_recommendations
-                    analysis_type = "ai"
-                    logger.info(f"AI analysis completed: {len(recommendations)} recommendations")
-                else:
-                    logger.info("AI analysis returned no recommendations, using rule-based results")
-            except Exception as ai_error:
-                logger.warning(f"AI analysis failed, using rule-based results: {str(ai_error)}")
-                # Continue with rule-based recommendations
-        else:
-            logger.info("AI agent not available, using rule-based analysis")
+            stream = ai_agent.astream_jobs_and_clusters(
+                jobs=jobs, clusters=clusters, job_runs=job_runs, outcome=outcome
+            )
+            for rec in _iterate_async(stream):
+                recommendations.append(rec)
+                yield _sse_event("recommendation", rec)
+        except Exception as e:
+            logger.error("Error in streaming analysis: %s", e, exc_info=True)
+            yield _sse_event("error", {"error": str(e)})
+            return
         
-        # Ensure we have at least some recommendations
-        if not recommendations:
-            recommendations = [{
-                "id": "rec_no_data",
-                "type": "info",
-                "severity": "low",
-                "title": "Analysis Complete",
-                "description": f"Analyzed {len(jobs)} jobs and {len(clusters)} clusters. No immediate optimization opportunities detected.",
-                "estimated_savings": "Continue monitoring",
-                "risk": "None",
-            }]
-        
-        # Update cache
-        global analysis_cache, cache_timestamp
+        cache_timestamp = datetime.now(timezone.utc)
         analysis_cache = {
             "recommendations": recommendations,
             "jobs_count": len(jobs),
             "clusters_count": len(clusters),
-            "timestamp": datetime.utcnow().isoformat(),
-            "analysis_type": analysis_type
+            "timestamp": cache_timestamp.isoformat(),
+            "analysis_type": outcome["analysis_type"]
         }
-        cache_timestamp = datetime.utcnow()
-        
-        return jsonify({
-            "recommendations": recommendations,
-            "summary": {
-                "total_jobs": len(jobs),
-                "total_clusters": len(clusters),
-                "recommendations_count": len(recommendations),
-                "analysis_type": analysis_type,
-                "timestamp": cache_timestamp.isoformat()
-            }
-        })
+        summary = {
+            "total_jobs": len(jobs),
+            "total_clusters": len(clusters),
+            "recommendations_count": len(recommendations),
+            "analysis_type": outcome["analysis_type"],
+            "timestamp": cache_timestamp.isoformat()
+        }
+        yield _sse_event("done", summary)
     
-    except Exception as e:
-        logger.error(f"Error in analysis: {str(e)}", exc_info=True)
-        return jsonify({"error": str(e)}), 500
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @app.route("/api/recommendations", methods=["GET"])
 def get_recommendations():
-    """Get cached recommendations."""
-    if not analysis_cache or not analysis_cache.get("recommendations"):
-        return jsonify({
+    """Get cached recommendations.
+    
+    The body only changes when an analysis replaces the cache, so the
+    analysis timestamp is sent as the ETag and a matching If-None-Match is
+    answered with an empty 304 instead of re-encoding the recommendations.
+    """
+    cache = analysis_cache
+    etag = cache.get("timestamp") or "empty"
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    elif not cache or not cache.get("recommendations"):
+        response = jsonify({
             "recommendations": [],
             "has_analysis": False,
             "message": "No analysis available. Run /api/analyze first."
-        }), 200
+        })
+    else:
+        response = _cached_json_response("recommendations", cache, lambda cache: {
+            **cache,
+            "has_analysis": True
+        })
     
-    return jsonify({
-        **analysis_cache,
-        "has_analysis": True
-    })
+    response.set_etag(etag)
+    # Clients may keep the body but must revalidate it on every poll
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @app.route("/api/recommendations/real-time", methods=["GET"])
 def get_recommendations_realtime():
     """Get real-time recommendations (returns cached analysis if available)."""
     # First check if we have cached analysis
-    if analysis_cache and analysis_cache.get("recommendations"):
-        return jsonify({
-            **analysis_cache,
+    cache = analysis_cache
+    if cache and cache.get("recommendations"):
+        return _cached_json_response("recommendations/real-time", cache, lambda cache: {
+            **cache,
             "real_time": True,
             "has_analysis": True,
-            "timestamp": cache_timestamp.isoformat() if cache_timestamp else datetime.utcnow().isoformat()
+            "timestamp": cache.get("timestamp") or _now_iso()
         })
     
     # If no cache, check if services are configured
-    if not databricks_client:
+    if not get_databricks_client():
         return jsonify({
             "recommendations": [],
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "real_time": True,
             "has_analysis": False,
             "message": "No analysis available. Databricks client not configured. Please configure Databricks credentials and run an analysis first."
         }), 200
     
-    if not ai_agent:
+    if not get_ai_agent():
         return jsonify({
             "recommendations": [],
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
             "real_time": True,
             "has_analysis": False,
             "message": "No analysis available. AI agent not configured. Please configure OpenAI/Azure OpenAI credentials and run an analysis first."
@@ -315,7 +616,7 @@ def get_recommendations_realtime():
     # If no cache but services are configured, return message to run analysis
     return jsonify({
         "recommendations": [],
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _now_iso(),
         "real_time": True,
         "has_analysis": False,
         "message": "No analysis available. Please run an analysis first."
@@ -325,106 +626,107 @@ def get_recommendations_realtime():
 @app.route("/api/stats", methods=["GET"])
 def get_stats():
     """Get overall statistics."""
+    databricks_client = get_databricks_client()
     if not databricks_client:
         return jsonify({"error": "Databricks client not configured"}), 503
     
     try:
-        jobs = databricks_client.get_all_jobs()
-        clusters = databricks_client.get_all_clusters()
-        
-        running_clusters = [c for c in clusters if c.get("state") == "RUNNING"]
+        global _stats_counts
+        jobs, clusters, _ = _run_async(databricks_client.afetch_jobs_and_clusters(runs_for_jobs=0))
+        clusters = databricks_client.get_all_clusters_columnar(clusters)
+        memo_jobs, memo_clusters, counts = _stats_counts
+        if memo_jobs is not jobs or memo_clusters is not clusters:
+            states = clusters["state"]
+            # Running clusters with no workers are idle; both counts in one pass
+            running_clusters = idle_clusters = 0
+            for state, num_workers in zip(states, clusters["num_workers"]):
+                if state == "RUNNING":
+                    running_clusters += 1
+                    if not num_workers:
+                        idle_clusters += 1
+            counts = {
+                "total_jobs": len(jobs),
+                "total_clusters": len(states),
+                "running_clusters": running_clusters,
+                "idle_clusters": idle_clusters,
+            }
+            _stats_counts = (jobs, clusters, counts)
         
-        return jsonify({
-            "total_jobs": len(jobs),
-            "total_clusters": len(clusters),
-            "running_clusters": len(running_clusters),
-            "idle_clusters": len([c for c in running_clusters if c.get("num_workers", 0) > 0]),
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        return jsonify({**counts, "timestamp": _now_iso()})
     
     except Exception as e:
-        logger.error(f"Error fetching stats: {str(e)}")
+        logger.error("Error fetching stats: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
 @app.route("/api/summary", methods=["GET"])
 def get_summary():
     """Get summary metrics including cost savings and optimization statistics."""
+    global _summary_body
+    source = analysis_cache
+    if _summary_body[0] is source and _summary_body[1] is not None:
+        return app.response_class(_summary_body[1], mimetype=app.json.mimetype)
+    
     try:
         # Get recommendations from cache
-        recommendations = analysis_cache.get("recommendations", []) if analysis_cache else []
+        recommendations = source.get("recommendations", []) if source else []
         
         # Calculate metrics
         total_recommendations = len(recommendations)
         
-        # Calculate cost savings
+        # Aggregate savings, type/severity counts and resources in one pass
         total_savings = 0
         savings_by_type = {"cost_leak": 0, "value_leak": 0, "optimization_opportunity": 0}
+        by_type = {"cost_leak": 0, "value_leak": 0, "optimization_opportunity": 0}
+        by_severity = {"high": 0, "medium": 0, "low": 0}
+        # Distinct (resource_type, resource_id) pairs, and their count per type
+        seen_resources = set()
+        resources_count = {}
         
         for rec in recommendations:
-            savings_str = rec.get("estimated_savings", "")
+            get = rec.get
+            rec_type = get("type")
+            if rec_type in by_type:
+                by_type[rec_type] += 1
+            severity = get("severity")
+            if severity in by_severity:
+                by_severity[severity] += 1
+            
+            savings_str = get("estimated_savings", "")
             if savings_str:
-                # Try to extract numeric value (handles "$500/month", "30%", etc.)
-                import re
-                # Extract numbers (including decimals)
-                numbers = re.findall(r'\d+\.?\d*', savings_str)
-                if numbers:
-                    savings_value = float(numbers[0])
-                    # If it's a percentage, estimate based on average (rough calculation)
-                    if '%' in savings_str.lower():
-                        savings_value = savings_value * 100  # Rough estimate: treat % as base amount
+                savings_value = parse_estimated_savings(savings_str)
+                if savings_value is not None:
                     total_savings += savings_value
                     
                     # Track by type
-                    rec_type = rec.get("type", "optimization_opportunity")
-                    if rec_type in savings_by_type:
-                        savings_by_type[rec_type] += savings_value
-        
-        # Count by type
-        by_type = {
-            "cost_leak": len([r for r in recommendations if r.get("type") == "cost_leak"]),
-            "value_leak": len([r for r in recommendations if r.get("type") == "value_leak"]),
-            "optimization_opportunity": len([r for r in recommendations if r.get("type") == "optimization_opportunity"])
-        }
-        
-        # Count by severity
-        by_severity = {
-            "high": len([r for r in recommendations if r.get("severity") == "high"]),
-            "medium": len([r for r in recommendations if r.get("severity") == "medium"]),
-            "low": len([r for r in recommendations if r.get("severity") == "low"])
-        }
-        
-        # Count unique jobs identified for optimization
-        job_ids = set()
-        for rec in recommendations:
-            if rec.get("resource_type") == "job":
-                resource_id = rec.get("resource_id")
-                if resource_id:
-                    job_ids.add(str(resource_id))
-        
-        # Count unique resources by type
-        resources_by_type = {}
-        for rec in recommendations:
-            res_type = rec.get("resource_type", "unknown")
-            if res_type not in resources_by_type:
-                resources_by_type[res_type] = set()
-            resource_id = rec.get("resource_id")
+                    savings_type = get("type", "optimization_opportunity")
+                    if savings_type in savings_by_type:
+                        savings_by_type[savings_type] += savings_value
+            
+            # Count unique resources by type
+            res_type = get("resource_type", "unknown")
+            type_count = resources_count.setdefault(res_type, 0)
+            resource_id = get("resource_id")
             if resource_id:
-                resources_by_type[res_type].add(str(resource_id))
+                resource = (res_type, str(resource_id))
+                if resource not in seen_resources:
+                    seen_resources.add(resource)
+                    resources_count[res_type] = type_count + 1
         
-        resources_count = {k: len(v) for k, v in resources_by_type.items()}
+        jobs_identified = resources_count.get("job", 0)
+        resources_optimized = len(seen_resources)
         
         # Get analysis metadata
-        analysis_timestamp = cache_timestamp.isoformat() if cache_timestamp else None
-        jobs_analyzed = analysis_cache.get("jobs_count", 0) if analysis_cache else 0
-        clusters_analyzed = analysis_cache.get("clusters_count", 0) if analysis_cache else 0
+        analysis_timestamp = source.get("timestamp") if source else None
+        jobs_analyzed = source.get("jobs_count", 0) if source else 0
+        clusters_analyzed = source.get("clusters_count", 0) if source else 0
         
-        return jsonify({
+        response = jsonify({
             "total_cost_savings": round(total_savings, 2),
             "total_cost_savings_formatted": f"${total_savings:,.2f}",
             "total_recommendations": total_recommendations,
-            "jobs_identified": len(job_ids),
-            "resources_optimized": sum(resources_count.values()),
+            "jobs_identified": jobs_identified,
+            "resources_optimized": resources_optimized,
             "by_type": by_type,
             "by_severity": by_severity,
             "savings_by_type": {k: round(v, 2) for k, v in savings_by_type.items()},
@@ -439,12 +741,14 @@ def get_summary():
                 "recommendations_generated": total_recommendations,
                 "high_priority_actions": by_severity["high"],
                 "potential_monthly_savings": round(total_savings, 2),
-                "optimization_coverage": f"{len(job_ids)} jobs, {sum(resources_count.values())} resources"
+                "optimization_coverage": f"{jobs_identified} jobs, {resources_optimized} resources"
             }
         })
+        _summary_body = (source, response.get_data())
+        return response
     
     except Exception as e:
-        logger.error(f"Error generating summary: {str(e)}")
+        logger.error("Error generating summary: %s", e)
         return jsonify({
             "error": str(e),
             "total_cost_savings": 0,
@@ -457,21 +761,29 @@ def get_summary():
 @app.route("/api/debug/clusters", methods=["GET"])
 def debug_clusters():
     """Debug endpoint to test cluster fetching."""
+    databricks_client = get_databricks_client()
     if not databricks_client:
         return jsonify({"error": "Databricks client not configured"}), 503
     
     try:
         logger.info("Debug: Testing cluster fetching...")
         clusters = databricks_client.get_all_clusters()
+        host = databricks_client.host
         
-        return jsonify({
-            "processed_clusters_count": len(clusters),
-            "clusters": clusters,
-            "client_host": databricks_client.host,
-        })
+        def generate():
+            # Same document jsonify would build, encoded a batch of clusters
+            # at a time so the full body is never held in memory at once
+            yield b'{"processed_clusters_count":' + orjson.dumps(len(clusters)) + b',"clusters":['
+            for start in range(0, len(clusters), _DEBUG_CLUSTERS_BATCH):
+                batch = clusters[start:start + _DEBUG_CLUSTERS_BATCH]
+                chunk = b",".join(orjson.dumps(cluster, default=app.json.default, option=orjson.OPT_NON_STR_KEYS) for cluster in batch)
+                yield b"," + chunk if start else chunk
+            yield b'],"client_host":' + orjson.dumps(host) + b"}"
+        
+        return Response(generate(), mimetype="application/json")
     
     except Exception as e:
-        logger.error(f"Debug error: {str(e)}", exc_info=True)
+        logger.error("Debug error: %s", e, exc_info=True)
         return jsonify({
             "error": str(e),
             "error_type": type(e).__name__,
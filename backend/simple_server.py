@@ -1,154 +1,358 @@
 """Simple HTTP server for ClusterIQ using Python's built-in http.server."""
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
-import json
+from collections import OrderedDict
+from concurrent.futures import Future
 import logging
-from datetime import datetime
+import orjson
+import re
+import threading
+import time
+from datetime import datetime, timezone
 
 from config import settings
 from databricks_client import DatabricksClient
+from basic_analysis import parse_estimated_savings, perform_basic_analysis, perform_compute_analysis
+from compression import choose_encoding, compress_body
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Clients are created on first use (see get_databricks_client and
+# get_ai_agent) rather than at import, so the server binds and answers /health
+# without waiting for the Databricks and LLM clients
+_databricks_client = None
+_databricks_client_ready = False
+_ai_agent = None
+_ai_agent_ready = False
+_databricks_client_lock = threading.Lock()
+_ai_agent_lock = threading.Lock()
+# Analysis results; replaced wholesale, never mutated in place, so a handler
+# holding one reference sees a single consistent analysis
+analysis_cache = {}
+# Encoded /api/summary body and the analysis_cache it summarizes; the cache is
+# replaced, never mutated, so its identity tells whether the body is current
+_summary_body = (None, None)
+# Encoded /api/recommendations and /api/recommendations/real-time bodies, by
+# the same identity rule
+_recommendations_body = (None, None)
+_realtime_body = (None, None)
+# /api/analyze run in progress, if any; concurrent requests wait on it
+_analysis_inflight = None
+_analysis_inflight_lock = threading.Lock()
+# Encoded listing bodies: key -> (listing, body). The client returns the same
+# list object while its cached response is fresh, so a body is re-encoded only
+# after the listing is refetched.
+_LISTING_BODIES_SIZE = 64
+_listing_bodies = OrderedDict()
+_listing_bodies_lock = threading.Lock()
+
+# Running and idle cluster counts and the columnar cluster view they were
+# computed from; the view is the same object while the client cache is fresh
+_cluster_state_counts = (None, None)
+
+# Bodies that never change, encoded once. Settings are fixed at startup, so
+# /health only appends the timestamp to a prebuilt prefix.
+_NOT_FOUND_BODY = orjson.dumps({"error": "Not found"})
+_NO_CLIENT_BODY = orjson.dumps({"error": "Databricks client not configured"})
+_HEALTH_BODY_PREFIX = orjson.dumps({
+    "status": "healthy",
+    # From settings, so health checks never wait on client creation
+    "databricks_configured": bool(settings.databricks_host and settings.databricks_token),
+    "ai_configured": bool(
+        settings.openai_api_key
+        or (settings.azure_openai_endpoint and settings.azure_openai_api_key
+            and settings.azure_openai_deployment_name)
+    ),
+})[:-1] + b',"timestamp":'
+
+# Compute resource listings besides jobs and clusters, used by /api/stats and
+# the AI analysis; fetched together with get_all_compute_resources
+_OTHER_COMPUTE_KEYS = (
+    "sql_warehouses", "pools", "vector_search", "policies", "apps",
+    "lakebase_provisioned", "ml_jobs", "mlflow_experiments", "mlflow_models",
+    "model_serving_endpoints", "feature_store_tables",
+)
+
+# GET routes: path -> (APIHandler method name, whether the Databricks client
+# is required). /api/jobs/<id>/runs and /api/clusters/<id>/metrics are
+# matched by _PARAM_ROUTE_RE and dispatched through _PARAM_ROUTES.
+_GET_ROUTES = {
+    '/': ('_get_health', False),
+    '/health': ('_get_health', False),
+    '/api/jobs': ('_get_listing', True),
+    '/api/clusters': ('_get_clusters', True),
+    '/api/sql-warehouses': ('_get_listing', True),
+    '/api/pools': ('_get_listing', True),
+    '/api/vector-search': ('_get_listing', True),
+    '/api/policies': ('_get_listing', True),
+    '/api/apps': ('_get_listing', True),
+    '/api/lakebase': ('_get_listing', True),
+    '/api/ml-jobs': ('_get_listing', True),
+    '/api/mlflow-experiments': ('_get_listing', True),
+    '/api/mlflow-models': ('_get_listing', True),
+    '/api/model-serving': ('_get_listing', True),
+    '/api/feature-store': ('_get_listing', True),
+    '/api/compute': ('_get_compute', True),
+    '/api/stats': ('_get_stats', True),
+    '/api/recommendations': ('_get_recommendations', False),
+    '/api/recommendations/real-time': ('_get_recommendations_realtime', False),
+    '/api/summary': ('_get_summary', False),
+}
+
+# Parameterized GET routes: (resource, action) from _PARAM_ROUTE_RE ->
+# APIHandler method name, called with the id from the path
+_PARAM_ROUTE_RE = re.compile(r"^/api/(jobs|clusters)/([^/]+)/(runs|metrics)$")
+_PARAM_ROUTES = {
+    ('jobs', 'runs'): '_get_job_runs',
+    ('clusters', 'metrics'): '_get_cluster_metrics',
+}
+
+# DatabricksClient getter behind each _get_listing route
+_LISTING_GETTERS = {
+    '/api/jobs': 'get_all_jobs',
+    '/api/sql-warehouses': 'get_sql_warehouses',
+    '/api/pools': 'get_instance_pools',
+    '/api/vector-search': 'get_vector_search_endpoints',
+    '/api/policies': 'get_cluster_policies',
+    '/api/apps': 'get_apps',
+    '/api/lakebase': 'get_lakebase_provisioned',
+    '/api/ml-jobs': 'get_ml_jobs',
+    '/api/mlflow-experiments': 'get_mlflow_experiments',
+    '/api/mlflow-models': 'get_mlflow_models',
+    '/api/model-serving': 'get_model_serving_endpoints',
+    '/api/feature-store': 'get_feature_store_tables',
+}
+
+# Response timestamps are re-formatted at most every _NOW_ISO_INTERVAL
+# seconds; polled endpoints share the string within that window
+_NOW_ISO_INTERVAL = 0.1
+_now_iso_cache = (float("-inf"), "")
+
+
+def _now_iso() -> str:
+    """Return the current UTC time as an ISO 8601 string, at ~100ms granularity."""
+    global _now_iso_cache
+    checked_at, formatted = _now_iso_cache
+    now = time.monotonic()
+    if now - checked_at >= _NOW_ISO_INTERVAL:
+        formatted = datetime.now(timezone.utc).isoformat()
+        _now_iso_cache = (now, formatted)
+    return formatted
+
+
+def get_databricks_client():
+    """Return the shared Databricks client, creating it on first use.
+    
+    Returns:
+        The client, or None when Databricks is not configured or the client
+        could not be created
+    """
+    global _databricks_client, _databricks_client_ready
+    if not _databricks_client_ready:
+        with _databricks_client_lock:
+            if not _databricks_client_ready:
+                try:
+                    if settings.databricks_host and settings.databricks_token:
+                        _databricks_client = DatabricksClient(
+                            host=settings.databricks_host,
+                            token=settings.databricks_token,
+                            cache_ttl=settings.update_interval
+                        )
+                        logger.info("Databricks client initialized")
+                except Exception as e:
+                    logger.error("Error initializing Databricks client: %s", e)
+                _databricks_client_ready = True
+    return _databricks_client
+
+
+def get_ai_agent():
+    """Return the shared AI agent, creating it on first use.
+    
+    Returns:
+        The agent, or None when no LLM provider is configured, langchain is not
+        installed or the agent could not be created
+    """
+    global _ai_agent, _ai_agent_ready
+    if not _ai_agent_ready:
+        with _ai_agent_lock:
+            if not _ai_agent_ready:
+                try:
+                    from ai_agent import get_agent
+                    _ai_agent = get_agent()
+                    if _ai_agent:
+                        logger.info("AI agent initialized")
+                except ImportError as e:
+                    logger.warning("AI agent not available (langchain not installed): %s", e)
+                    logger.info("Server will run without AI features. Clusters and jobs will still work.")
+                except Exception as e:
+                    logger.warning("Could not initialize AI agent: %s", e)
+                    logger.info("Server will run without AI features.")
+                _ai_agent_ready = True
+    return _ai_agent
 
-def perform_basic_analysis(jobs, clusters):
-    """Perform rule-based analysis without AI."""
+
+def _run_analysis(databricks_client):
+    """Fetch jobs and clusters, analyze them and store the result in analysis_cache.
+    
+    Args:
+        databricks_client: Client to fetch the workspace's resources with
+    
+    Returns:
+        The /api/analyze response payload
+    
+    Raises:
+        RuntimeError: If jobs and clusters could not be fetched
+    """
+    global analysis_cache
+    # Fetch jobs and clusters (core resources for basic analysis)
+    logger.info("Fetching jobs and clusters for analysis...")
+    try:
+        jobs, clusters = databricks_client.get_jobs_and_clusters()
+        logger.info("Fetched: %s jobs, %s clusters", len(jobs), len(clusters))
+    except Exception as fetch_error:
+        logger.error("Error fetching jobs/clusters: %s", fetch_error)
+        raise RuntimeError(f"Failed to fetch data: {str(fetch_error)}") from fetch_error
+    
+    # Always start with rule-based analysis for clusters and jobs
     recommendations = []
+    analysis_type = "rule-based"
     
-    # Analyze clusters
-    for cluster in clusters:
-        state = cluster.get("state", "")
-        num_workers = cluster.get("num_workers", 0)
-        cluster_name = cluster.get("cluster_name", "Unknown")
-        cluster_id = cluster.get("cluster_id")
-        
-        # Check for running clusters that might be idle
-        if state == "RUNNING":
-            if num_workers > 0:
-                recommendations.append({
-                    "id": f"rec_{len(recommendations)}",
-                    "type": "cost_leak",
-                    "severity": "medium",
-                    "title": f"Running cluster: {cluster_name}",
-                    "description": f"Cluster is running with {num_workers} workers. Monitor for idle time and consider auto-termination if not actively used.",
-                    "resource_type": "cluster",
-                    "resource_id": cluster_id,
-                    "current_config": {
-                        "num_workers": num_workers,
-                        "node_type": cluster.get("node_type_id"),
-                        "state": state,
-                        "autotermination_minutes": cluster.get("autotermination_minutes"),
-                    },
-                    "recommended_config": {
-                        "action": "Set auto-termination if cluster is idle for extended periods",
-                        "suggested_autotermination": 15,
-                    },
-                    "estimated_savings": "Medium - depends on idle time",
-                    "risk": "Low",
-                })
+    # Perform basic rule-based analysis on clusters and jobs
+    logger.info("Performing rule-based analysis on clusters and jobs...")
+    try:
+        recommendations = list(perform_basic_analysis(jobs, clusters))
+        logger.info("Rule-based analysis generated %s recommendations", len(recommendations))
+    except Exception as basic_error:
+        logger.error("Error in rule-based analysis: %s", basic_error)
+        # Continue even if basic analysis fails
+    
+    # Other compute resources; only fetched for the AI analysis
+    ai_agent = get_ai_agent()
+    compute = None
+    (sql_warehouses, pools, vector_search, policies, apps, lakebase, ml_jobs,
+     mlflow_experiments, mlflow_models, model_serving, feature_store) = (
+        [] for _ in _OTHER_COMPUTE_KEYS
+    )
+    
+    # Try AI analysis if available (replaces the rule-based
+    # recommendations when it returns any)
+    if ai_agent:
+        try:
+            logger.info("Attempting AI-enhanced analysis...")
+            # Fetch additional resources for comprehensive analysis,
+            # all listings concurrently
+            compute = databricks_client.get_all_compute_resources(include=_OTHER_COMPUTE_KEYS)
+            (sql_warehouses, pools, vector_search, policies, apps, lakebase, ml_jobs,
+             mlflow_experiments, mlflow_models, model_serving, feature_store) = (
+                compute[key] for key in _OTHER_COMPUTE_KEYS
+            )
+            
+            job_runs = databricks_client.get_job_runs_bulk(
+                (job.get("job_id") for job in jobs[:10]), limit=10
+            )
+            
+            ai_recommendations = ai_agent.analyze_all_compute(
+                jobs=jobs,
+                clusters=clusters,
+                sql_warehouses=sql_warehouses,
+                pools=pools,
+                vector_search=vector_search,
+                policies=policies,
+                apps=apps,
+                lakebase=lakebase,
+                ml_jobs=ml_jobs,
+                mlflow_experiments=mlflow_experiments,
+                mlflow_models=mlflow_models,
+                model_serving=model_serving,
+                feature_store=feature_store,
+                job_runs=job_runs
+            )
+            # If AI analysis succeeds, use it (it's more comprehensive)
+            if ai_recommendations:
+                recommendations = ai_recommendations
+                analysis_type = "ai"
+                logger.info("AI analysis completed: %s recommendations", len(recommendations))
             else:
-                # Single node cluster
-                recommendations.append({
-                    "id": f"rec_{len(recommendations)}",
-                    "type": "optimization",
-                    "severity": "low",
-                    "title": f"Single-node cluster: {cluster_name}",
-                    "description": "Single-node cluster detected. Suitable for lightweight workloads.",
-                    "resource_type": "cluster",
-                    "resource_id": cluster_id,
-                    "current_config": {
-                        "num_workers": 0,
-                        "node_type": cluster.get("node_type_id"),
-                    },
-                    "recommended_config": {
-                        "action": "Continue using single-node for cost efficiency",
-                    },
-                    "estimated_savings": "Already optimized",
-                    "risk": "None",
-                })
-        
-        # Check for terminated clusters that were recently active
-        elif state == "TERMINATED":
-            terminated_time = cluster.get("terminated_time")
-            if terminated_time:
-                # Could add logic to check if it was terminated recently
-                pass
-    
-    # Analyze jobs
-    for job in jobs:
-        job_name = job.get("job_name", "Unknown")
-        job_id = job.get("job_id")
-        tasks = job.get("settings", {}).get("tasks", [])
-        
-        if len(tasks) == 0:
-            recommendations.append({
-                "id": f"rec_{len(recommendations)}",
-                "type": "optimization",
-                "severity": "low",
-                "title": f"Job with no tasks: {job_name}",
-                "description": "Job has no configured tasks. Consider reviewing job configuration.",
-                "resource_type": "job",
-                "resource_id": job_id,
-                "estimated_savings": "N/A",
-                "risk": "Low",
-            })
-    
-    # If no recommendations, add a summary
-    if len(recommendations) == 0:
-        recommendations.append({
-            "id": "rec_summary",
+                logger.info("AI analysis returned no recommendations, using rule-based results")
+        except Exception as ai_error:
+            logger.warning("AI analysis failed, using rule-based results: %s", ai_error)
+    else:
+        logger.info("AI agent not available, using rule-based analysis")
+    
+    # Rule-based results also cover running SQL warehouses and
+    # unused instance pools
+    if analysis_type == "rule-based":
+        try:
+            if compute is None:
+                compute = databricks_client.get_all_compute_resources(include=("sql_warehouses", "pools"))
+                sql_warehouses, pools = compute["sql_warehouses"], compute["pools"]
+            recommendations.extend(perform_compute_analysis(sql_warehouses, pools, len(recommendations)))
+            logger.info("Rule-based analysis completed: %s recommendations", len(recommendations))
+        except Exception as compute_error:
+            logger.error("Error analyzing SQL warehouses and pools: %s", compute_error, exc_info=True)
+    
+    if not recommendations:
+        recommendations = [{
+            "id": "rec_error",
             "type": "info",
             "severity": "low",
             "title": "Analysis Complete",
-            "description": f"Analyzed {len(jobs)} jobs and {len(clusters)} clusters. No immediate optimization opportunities detected.",
+            "description": f"Analyzed {len(jobs)} jobs and {len(clusters)} clusters. Some analysis features may be limited.",
             "estimated_savings": "Continue monitoring",
             "risk": "None",
-        })
+        }]
     
-    return recommendations
-
-# Initialize clients
-databricks_client = None
-ai_agent = None
-analysis_cache = {}
-cache_timestamp = None
-
-# Initialize clients
-try:
-    if settings.databricks_host and settings.databricks_token:
-        databricks_client = DatabricksClient(
-            host=settings.databricks_host,
-            token=settings.databricks_token
-        )
-        logger.info("Databricks client initialized")
+    # Count each listing once for both the cache and the response
+    jobs_count, clusters_count = len(jobs), len(clusters)
+    sql_warehouses_count, pools_count = len(sql_warehouses), len(pools)
+    vector_search_count, policies_count = len(vector_search), len(policies)
+    apps_count, lakebase_count, ml_jobs_count = len(apps), len(lakebase), len(ml_jobs)
+    mlflow_experiments_count, mlflow_models_count = len(mlflow_experiments), len(mlflow_models)
+    model_serving_count, feature_store_count = len(model_serving), len(feature_store)
     
-    # Try to initialize AI agent (optional)
-    try:
-        from ai_agent import ClusterIQAgent
-        if settings.azure_openai_endpoint and settings.azure_openai_api_key and settings.azure_openai_deployment_name:
-            ai_agent = ClusterIQAgent(
-                azure_endpoint=settings.azure_openai_endpoint,
-                azure_api_key=settings.azure_openai_api_key,
-                azure_deployment_name=settings.azure_openai_deployment_name,
-                model=settings.openai_model
-            )
-            logger.info("AI agent initialized")
-        elif settings.openai_api_key:
-            ai_agent = ClusterIQAgent(
-                api_key=settings.openai_api_key,
-                model=settings.openai_model
-            )
-            logger.info("AI agent initialized")
-    except ImportError as e:
-        logger.warning(f"AI agent not available (langchain not installed): {str(e)}")
-        logger.info("Server will run without AI features. Clusters and jobs will still work.")
-    except Exception as e:
-        logger.warning(f"Could not initialize AI agent: {str(e)}")
-        logger.info("Server will run without AI features.")
-        
-except Exception as e:
-    logger.error(f"Error during startup: {str(e)}")
+    timestamp = datetime.now(timezone.utc).isoformat()
+    analysis_cache = {
+        "recommendations": recommendations,
+        "jobs_count": jobs_count,
+        "clusters_count": clusters_count,
+        "sql_warehouses_count": sql_warehouses_count,
+        "pools_count": pools_count,
+        "vector_search_count": vector_search_count,
+        "policies_count": policies_count,
+        "apps_count": apps_count,
+        "lakebase_count": lakebase_count,
+        "ml_jobs_count": ml_jobs_count,
+        "mlflow_experiments_count": mlflow_experiments_count,
+        "mlflow_models_count": mlflow_models_count,
+        "model_serving_count": model_serving_count,
+        "feature_store_count": feature_store_count,
+        "timestamp": timestamp,
+        "analysis_type": analysis_type
+    }
+    
+    return {
+        "recommendations": recommendations,
+        "summary": {
+            "total_jobs": jobs_count,
+            "total_clusters": clusters_count,
+            "sql_warehouses": sql_warehouses_count,
+            "pools": pools_count,
+            "vector_search_endpoints": vector_search_count,
+            "policies": policies_count,
+            "apps": apps_count,
+            "lakebase_resources": lakebase_count,
+            "ml_jobs": ml_jobs_count,
+            "mlflow_experiments": mlflow_experiments_count,
+            "mlflow_models": mlflow_models_count,
+            "model_serving_endpoints": model_serving_count,
+            "feature_store_tables": feature_store_count,
+            "recommendations_count": len(recommendations),
+            "timestamp": timestamp,
+            "analysis_type": analysis_type,
+            "ai_available": ai_agent is not None
+        }
+    }
 
 
 class APIHandler(BaseHTTPRequestHandler):
@@ -162,11 +366,36 @@ class APIHandler(BaseHTTPRequestHandler):
     
     def _send_json_response(self, data, status=200):
         """Send JSON response."""
+        self._send_json_body(orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS), status)
+    
+    def _send_listing_response(self, key, listing):
+        """Send a client listing as JSON, reusing its encoded body while it is unchanged."""
+        with _listing_bodies_lock:
+            entry = _listing_bodies.get(key)
+            if entry is not None:
+                _listing_bodies.move_to_end(key)
+        if entry is None or entry[0] is not listing:
+            entry = (listing, orjson.dumps(listing, default=str, option=orjson.OPT_NON_STR_KEYS))
+            with _listing_bodies_lock:
+                _listing_bodies[key] = entry
+                while len(_listing_bodies) > _LISTING_BODIES_SIZE:
+                    _listing_bodies.popitem(last=False)
+        self._send_json_body(entry[1])
+    
+    def _send_json_body(self, body, status=200):
+        """Send an already encoded JSON response body, compressed if the client accepts it."""
+        encoding = choose_encoding(self.headers.get('Accept-Encoding', ''), len(body))
+        if encoding:
+            body = compress_body(body, encoding)
         self.send_response(status)
         self.send_header('Content-Type', 'application/json')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
         self._set_cors_headers()
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode('utf-8'))
+        self.wfile.write(body)
     
     def do_OPTIONS(self):
         """Handle OPTIONS request for CORS."""
@@ -180,525 +409,301 @@ class APIHandler(BaseHTTPRequestHandler):
         path = parsed_path.path
         
         try:
-            if path == '/' or path == '/health':
-                self._send_json_response({
-                    "status": "healthy",
-                    "databricks_configured": databricks_client is not None,
-                    "ai_configured": ai_agent is not None,
-                    "timestamp": datetime.utcnow().isoformat()
-                })
-            
-            elif path == '/api/jobs':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                jobs = databricks_client.get_all_jobs()
-                self._send_json_response(jobs)
-            
-            elif path.startswith('/api/jobs/') and '/runs' in path:
-                job_id = int(path.split('/')[3])
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
+            route = _GET_ROUTES.get(path)
+            args = ()
+            if route is None:
+                match = _PARAM_ROUTE_RE.match(path)
+                handler = match and _PARAM_ROUTES.get((match.group(1), match.group(3)))
+                if not handler:
+                    self._send_json_body(_NOT_FOUND_BODY, 404)
                     return
-                runs = databricks_client.get_job_runs(job_id=job_id)
-                self._send_json_response(runs)
-            
-            elif path == '/api/clusters':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                logger.info("API: Fetching clusters...")
-                clusters = databricks_client.get_all_clusters()
-                logger.info(f"API: Returning {len(clusters)} clusters")
-                self._send_json_response(clusters)
-            
-            elif path.startswith('/api/clusters/') and path.endswith('/metrics'):
-                cluster_id = path.split('/')[3]
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                metrics = databricks_client.get_cluster_metrics(cluster_id)
-                self._send_json_response(metrics)
-            
-            elif path == '/api/sql-warehouses':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                warehouses = databricks_client.get_sql_warehouses()
-                self._send_json_response(warehouses)
-            
-            elif path == '/api/pools':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                pools = databricks_client.get_instance_pools()
-                self._send_json_response(pools)
-            
-            elif path == '/api/vector-search':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                endpoints = databricks_client.get_vector_search_endpoints()
-                self._send_json_response(endpoints)
-            
-            elif path == '/api/policies':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                policies = databricks_client.get_cluster_policies()
-                self._send_json_response(policies)
-            
-            elif path == '/api/apps':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                apps = databricks_client.get_apps()
-                self._send_json_response(apps)
-            
-            elif path == '/api/lakebase':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                lakebase = databricks_client.get_lakebase_provisioned()
-                self._send_json_response(lakebase)
-            
-            elif path == '/api/ml-jobs':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                ml_jobs = databricks_client.get_ml_jobs()
-                self._send_json_response(ml_jobs)
-            
-            elif path == '/api/mlflow-experiments':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                experiments = databricks_client.get_mlflow_experiments()
-                self._send_json_response(experiments)
-            
-            elif path == '/api/mlflow-models':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                models = databricks_client.get_mlflow_models()
-                self._send_json_response(models)
-            
-            elif path == '/api/model-serving':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                endpoints = databricks_client.get_model_serving_endpoints()
-                self._send_json_response(endpoints)
-            
-            elif path == '/api/feature-store':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                tables = databricks_client.get_feature_store_tables()
-                self._send_json_response(tables)
-            
-            elif path == '/api/compute':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                all_compute = databricks_client.get_all_compute_resources()
-                self._send_json_response(all_compute)
-            
-            elif path == '/api/stats':
-                if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                jobs = databricks_client.get_all_jobs()
-                clusters = databricks_client.get_all_clusters()
-                warehouses = databricks_client.get_sql_warehouses()
-                pools = databricks_client.get_instance_pools()
-                vector_search = databricks_client.get_vector_search_endpoints()
-                policies = databricks_client.get_cluster_policies()
-                apps = databricks_client.get_apps()
-                lakebase = databricks_client.get_lakebase_provisioned()
-                ml_jobs = databricks_client.get_ml_jobs()
-                mlflow_experiments = databricks_client.get_mlflow_experiments()
-                mlflow_models = databricks_client.get_mlflow_models()
-                model_serving = databricks_client.get_model_serving_endpoints()
-                feature_store = databricks_client.get_feature_store_tables()
-                running_clusters = [c for c in clusters if c.get("state") == "RUNNING"]
-                self._send_json_response({
-                    "total_jobs": len(jobs),
-                    "total_clusters": len(clusters),
-                    "running_clusters": len(running_clusters),
-                    "sql_warehouses": len(warehouses),
-                    "pools": len(pools),
-                    "vector_search_endpoints": len(vector_search),
-                    "policies": len(policies),
-                    "apps": len(apps),
-                    "lakebase_resources": len(lakebase),
-                    "ml_jobs": len(ml_jobs),
-                    "mlflow_experiments": len(mlflow_experiments),
-                    "mlflow_models": len(mlflow_models),
-                    "model_serving_endpoints": len(model_serving),
-                    "feature_store_tables": len(feature_store),
-                    "idle_clusters": len([c for c in running_clusters if c.get("num_workers", 0) > 0]),
-                    "timestamp": datetime.utcnow().isoformat()
-                })
-            
-            elif path == '/api/recommendations':
-                if not analysis_cache or not analysis_cache.get("recommendations"):
-                    self._send_json_response({
-                        "recommendations": [],
-                        "has_analysis": False,
-                        "message": "No analysis available. Please run analysis first."
-                    }, 200)
-                    return
-                response_data = {
-                    **analysis_cache,
-                    "has_analysis": True
-                }
-                self._send_json_response(response_data)
-            
-            elif path == '/api/recommendations/real-time':
-                # Real-time recommendations endpoint - same as regular recommendations
-                if not analysis_cache or not analysis_cache.get("recommendations"):
-                    self._send_json_response({
-                        "recommendations": [],
-                        "timestamp": datetime.utcnow().isoformat(),
-                        "real_time": True,
-                        "message": "No analysis available. Please run analysis first.",
-                        "has_analysis": False
-                    }, 200)
-                    return
-                
-                # Return recommendations in real-time format
-                response_data = {
-                    **analysis_cache,
-                    "real_time": True,
-                    "has_analysis": True,
-                    "timestamp": cache_timestamp.isoformat() if cache_timestamp else datetime.utcnow().isoformat()
-                }
-                self._send_json_response(response_data)
-            
-            elif path == '/api/summary':
-                # Calculate summary metrics from recommendations
-                try:
-                    recommendations = analysis_cache.get("recommendations", []) if analysis_cache else []
-                    total_recommendations = len(recommendations)
-                    
-                    # Calculate cost savings
-                    import re
-                    total_savings = 0
-                    savings_by_type = {"cost_leak": 0, "value_leak": 0, "optimization_opportunity": 0}
-                    
-                    for rec in recommendations:
-                        savings_str = rec.get("estimated_savings", "")
-                        if savings_str:
-                            numbers = re.findall(r'\d+\.?\d*', savings_str)
-                            if numbers:
-                                savings_value = float(numbers[0])
-                                if '%' in savings_str.lower():
-                                    savings_value = savings_value * 100
-                                total_savings += savings_value
-                                rec_type = rec.get("type", "optimization_opportunity")
-                                if rec_type in savings_by_type:
-                                    savings_by_type[rec_type] += savings_value
-                    
-                    # Count by type and severity
-                    by_type = {
-                        "cost_leak": len([r for r in recommendations if r.get("type") == "cost_leak"]),
-                        "value_leak": len([r for r in recommendations if r.get("type") == "value_leak"]),
-                        "optimization_opportunity": len([r for r in recommendations if r.get("type") == "optimization_opportunity"])
-                    }
-                    
-                    by_severity = {
-                        "high": len([r for r in recommendations if r.get("severity") == "high"]),
-                        "medium": len([r for r in recommendations if r.get("severity") == "medium"]),
-                        "low": len([r for r in recommendations if r.get("severity") == "low"])
-                    }
-                    
-                    # Count unique jobs
-                    job_ids = set()
-                    resources_by_type = {}
-                    for rec in recommendations:
-                        if rec.get("resource_type") == "job":
-                            resource_id = rec.get("resource_id")
-                            if resource_id:
-                                job_ids.add(str(resource_id))
-                        res_type = rec.get("resource_type", "unknown")
-                        if res_type not in resources_by_type:
-                            resources_by_type[res_type] = set()
-                        resource_id = rec.get("resource_id")
-                        if resource_id:
-                            resources_by_type[res_type].add(str(resource_id))
-                    
-                    resources_count = {k: len(v) for k, v in resources_by_type.items()}
-                    
-                    analysis_timestamp = cache_timestamp.isoformat() if cache_timestamp else None
-                    jobs_analyzed = analysis_cache.get("jobs_count", 0) if analysis_cache else 0
-                    clusters_analyzed = analysis_cache.get("clusters_count", 0) if analysis_cache else 0
-                    
-                    self._send_json_response({
-                        "total_cost_savings": round(total_savings, 2),
-                        "total_cost_savings_formatted": f"${total_savings:,.2f}",
-                        "total_recommendations": total_recommendations,
-                        "jobs_identified": len(job_ids),
-                        "resources_optimized": sum(resources_count.values()),
-                        "by_type": by_type,
-                        "by_severity": by_severity,
-                        "savings_by_type": {k: round(v, 2) for k, v in savings_by_type.items()},
-                        "resources_by_type": resources_count,
-                        "analysis_metadata": {
-                            "timestamp": analysis_timestamp,
-                            "jobs_analyzed": jobs_analyzed,
-                            "clusters_analyzed": clusters_analyzed,
-                            "has_analysis": len(recommendations) > 0
-                        },
-                        "success_metrics": {
-                            "recommendations_generated": total_recommendations,
-                            "high_priority_actions": by_severity["high"],
-                            "potential_monthly_savings": round(total_savings, 2),
-                            "optimization_coverage": f"{len(job_ids)} jobs, {sum(resources_count.values())} resources"
-                        }
-                    })
-                except Exception as e:
-                    logger.error(f"Error generating summary: {str(e)}")
-                    self._send_json_response({
-                        "error": str(e),
-                        "total_cost_savings": 0,
-                        "total_recommendations": 0,
-                        "jobs_identified": 0,
-                        "has_analysis": False
-                    }, 500)
-            
-            else:
-                self._send_json_response({"error": "Not found"}, 404)
+                route = (handler, True)
+                args = (match.group(2),)
+            handler, needs_client = route
+            if needs_client and not get_databricks_client():
+                self._send_json_body(_NO_CLIENT_BODY, 503)
+                return
+            getattr(self, handler)(parsed_path, *args)
         
         except Exception as e:
-            logger.error(f"Error handling request: {str(e)}", exc_info=True)
+            logger.error("Error handling request: %s", e, exc_info=True)
             self._send_json_response({"error": str(e)}, 500)
     
+    def _get_health(self, parsed_path):
+        """Report service health."""
+        self._send_json_body(_HEALTH_BODY_PREFIX + orjson.dumps(_now_iso()) + b"}")
+    
+    def _get_listing(self, parsed_path):
+        """Send the listing behind a plain resource route."""
+        path = parsed_path.path
+        self._send_listing_response(path, getattr(get_databricks_client(), _LISTING_GETTERS[path])())
+    
+    def _get_clusters(self, parsed_path):
+        """Send all clusters."""
+        logger.info("API: Fetching clusters...")
+        clusters = get_databricks_client().get_all_clusters()
+        logger.info("API: Returning %s clusters", len(clusters))
+        self._send_listing_response('/api/clusters', clusters)
+    
+    def _get_job_runs(self, parsed_path, job_id):
+        """Send the recent runs of the job in the path."""
+        job_id = int(job_id)
+        runs = get_databricks_client().get_job_runs(job_id=job_id)
+        self._send_listing_response(('runs', job_id), runs)
+    
+    def _get_cluster_metrics(self, parsed_path, cluster_id):
+        """Send the metrics of the cluster in the path."""
+        metrics = get_databricks_client().get_cluster_metrics(cluster_id)
+        self._send_json_response(metrics)
+    
+    def _get_compute(self, parsed_path):
+        """Send all compute resources, or those listed in ?include=."""
+        # ?include=a,b limits the response to the listed resource types
+        include = parse_qs(parsed_path.query).get("include")
+        all_compute = get_databricks_client().get_all_compute_resources(
+            [key for value in include for key in value.split(",")] if include else None
+        )
+        self._send_json_response(all_compute)
+    
+    def _get_stats(self, parsed_path):
+        """Send resource counts."""
+        global _cluster_state_counts
+        databricks_client = get_databricks_client()
+        jobs, clusters = databricks_client.get_jobs_and_clusters()
+        clusters = databricks_client.get_all_clusters_columnar(clusters)
+        states = clusters["state"]
+        memo_clusters, counts = _cluster_state_counts
+        if memo_clusters is not clusters:
+            # Running clusters with no workers are idle; both counts in one pass
+            running_clusters = idle_clusters = 0
+            for state, num_workers in zip(states, clusters["num_workers"]):
+                if state == "RUNNING":
+                    running_clusters += 1
+                    if not num_workers:
+                        idle_clusters += 1
+            counts = (running_clusters, idle_clusters)
+            _cluster_state_counts = (clusters, counts)
+        running_clusters, idle_clusters = counts
+        # The other resource listings are requested concurrently
+        compute = databricks_client.get_all_compute_resources(include=_OTHER_COMPUTE_KEYS)
+        self._send_json_response({
+            "total_jobs": len(jobs),
+            "total_clusters": len(states),
+            "running_clusters": running_clusters,
+            "sql_warehouses": len(compute["sql_warehouses"]),
+            "pools": len(compute["pools"]),
+            "vector_search_endpoints": len(compute["vector_search"]),
+            "policies": len(compute["policies"]),
+            "apps": len(compute["apps"]),
+            "lakebase_resources": len(compute["lakebase_provisioned"]),
+            "ml_jobs": len(compute["ml_jobs"]),
+            "mlflow_experiments": len(compute["mlflow_experiments"]),
+            "mlflow_models": len(compute["mlflow_models"]),
+            "model_serving_endpoints": len(compute["model_serving_endpoints"]),
+            "feature_store_tables": len(compute["feature_store_tables"]),
+            "idle_clusters": idle_clusters,
+            "timestamp": _now_iso()
+        })
+    
+    def _get_recommendations(self, parsed_path):
+        """Send the cached recommendations."""
+        global _recommendations_body
+        cache = analysis_cache
+        if not cache or not cache.get("recommendations"):
+            self._send_json_response({
+                "recommendations": [],
+                "has_analysis": False,
+                "message": "No analysis available. Please run analysis first."
+            }, 200)
+            return
+        memo = _recommendations_body
+        if memo[0] is not cache:
+            memo = _recommendations_body = (cache, orjson.dumps({
+                **cache,
+                "has_analysis": True
+            }, default=str, option=orjson.OPT_NON_STR_KEYS))
+        self._send_json_body(memo[1])
+    
+    def _get_recommendations_realtime(self, parsed_path):
+        """Send the cached recommendations in real-time format."""
+        # Real-time recommendations endpoint - same as regular recommendations
+        cache = analysis_cache
+        if not cache or not cache.get("recommendations"):
+            self._send_json_response({
+                "recommendations": [],
+                "timestamp": _now_iso(),
+                "real_time": True,
+                "message": "No analysis available. Please run analysis first.",
+                "has_analysis": False
+            }, 200)
+            return
+        
+        # Return recommendations in real-time format
+        global _realtime_body
+        memo = _realtime_body
+        if memo[0] is not cache:
+            memo = _realtime_body = (cache, orjson.dumps({
+                **cache,
+                "real_time": True,
+                "has_analysis": True,
+                "timestamp": cache.get("timestamp") or _now_iso()
+            }, default=str, option=orjson.OPT_NON_STR_KEYS))
+        self._send_json_body(memo[1])
+    
+    def _get_summary(self, parsed_path):
+        """Send summary metrics of the cached recommendations."""
+        # Calculate summary metrics from recommendations
+        global _summary_body
+        source = analysis_cache
+        if _summary_body[0] is source and _summary_body[1] is not None:
+            self._send_json_body(_summary_body[1])
+            return
+        try:
+            recommendations = source.get("recommendations", []) if source else []
+            total_recommendations = len(recommendations)
+        
+            # Aggregate savings, type/severity counts and resources in one pass
+            total_savings = 0
+            savings_by_type = {"cost_leak": 0, "value_leak": 0, "optimization_opportunity": 0}
+            by_type = {"cost_leak": 0, "value_leak": 0, "optimization_opportunity": 0}
+            by_severity = {"high": 0, "medium": 0, "low": 0}
+            # Distinct (resource_type, resource_id) pairs, and their count per type
+            seen_resources = set()
+            resources_count = {}
+        
+            for rec in recommendations:
+                get = rec.get
+                rec_type = get("type")
+                if rec_type in by_type:
+                    by_type[rec_type] += 1
+                severity = get("severity")
+                if severity in by_severity:
+                    by_severity[severity] += 1
+        
+                savings_str = get("estimated_savings", "")
+                if savings_str:
+                    savings_value = parse_estimated_savings(savings_str)
+                    if savings_value is not None:
+                        total_savings += savings_value
+        
+                        # Track by type
+                        savings_type = get("type", "optimization_opportunity")
+                        if savings_type in savings_by_type:
+                            savings_by_type[savings_type] += savings_value
+        
+                # Count unique resources by type
+                res_type = get("resource_type", "unknown")
+                type_count = resources_count.setdefault(res_type, 0)
+                resource_id = get("resource_id")
+                if resource_id:
+                    resource = (res_type, str(resource_id))
+                    if resource not in seen_resources:
+                        seen_resources.add(resource)
+                        resources_count[res_type] = type_count + 1
+        
+            jobs_identified = resources_count.get("job", 0)
+            resources_optimized = len(seen_resources)
+        
+            analysis_timestamp = source.get("timestamp") if source else None
+            jobs_analyzed = source.get("jobs_count", 0) if source else 0
+            clusters_analyzed = source.get("clusters_count", 0) if source else 0
+        
+            body = orjson.dumps({
+                "total_cost_savings": round(total_savings, 2),
+                "total_cost_savings_formatted": f"${total_savings:,.2f}",
+                "total_recommendations": total_recommendations,
+                "jobs_identified": jobs_identified,
+                "resources_optimized": resources_optimized,
+                "by_type": by_type,
+                "by_severity": by_severity,
+                "savings_by_type": {k: round(v, 2) for k, v in savings_by_type.items()},
+                "resources_by_type": resources_count,
+                "analysis_metadata": {
+                    "timestamp": analysis_timestamp,
+                    "jobs_analyzed": jobs_analyzed,
+                    "clusters_analyzed": clusters_analyzed,
+                    "has_analysis": len(recommendations) > 0
+                },
+                "success_metrics": {
+                    "recommendations_generated": total_recommendations,
+                    "high_priority_actions": by_severity["high"],
+                    "potential_monthly_savings": round(total_savings, 2),
+                    "optimization_coverage": f"{jobs_identified} jobs, {resources_optimized} resources"
+                }
+            }, default=str, option=orjson.OPT_NON_STR_KEYS)
+            _summary_body = (source, body)
+            self._send_json_body(body)
+        except Exception as e:
+            logger.error("Error generating summary: %s", e)
+            self._send_json_response({
+                "error": str(e),
+                "total_cost_savings": 0,
+                "total_recommendations": 0,
+                "jobs_identified": 0,
+                "has_analysis": False
+            }, 500)
+    
     def do_POST(self):
-        """Handle POST requests."""
+        """Handle POST requests.
+        
+        POSTs to /api/analyze that arrive while an analysis is running wait for
+        it and share its result rather than starting another one.
+        """
+        global _analysis_inflight
         parsed_path = urlparse(self.path)
         path = parsed_path.path
         
         try:
             if path == '/api/analyze':
+                databricks_client = get_databricks_client()
                 if not databricks_client:
-                    self._send_json_response({"error": "Databricks client not configured"}, 503)
-                    return
-                
-                # Fetch jobs and clusters (core resources for basic analysis)
-                logger.info("Fetching jobs and clusters for analysis...")
-                try:
-                    jobs = databricks_client.get_all_jobs()
-                    clusters = databricks_client.get_all_clusters()
-                    logger.info(f"Fetched: {len(jobs)} jobs, {len(clusters)} clusters")
-                except Exception as fetch_error:
-                    logger.error(f"Error fetching jobs/clusters: {str(fetch_error)}")
-                    self._send_json_response({"error": f"Failed to fetch data: {str(fetch_error)}"}, 500)
+                    self._send_json_body(_NO_CLIENT_BODY, 503)
                     return
                 
-                # Always start with rule-based analysis for clusters and jobs
-                recommendations = []
-                analysis_type = "rule-based"
+                with _analysis_inflight_lock:
+                    future = _analysis_inflight
+                    leader = future is None
+                    if leader:
+                        future = _analysis_inflight = Future()
                 
-                # Perform basic rule-based analysis on clusters and jobs
-                logger.info("Performing rule-based analysis on clusters and jobs...")
-                try:
-                    basic_recommendations = perform_basic_analysis(jobs, clusters)
-                    recommendations.extend(basic_recommendations)
-                    logger.info(f"Rule-based analysis generated {len(basic_recommendations)} recommendations")
-                except Exception as basic_error:
-                    logger.error(f"Error in rule-based analysis: {str(basic_error)}")
-                    # Continue even if basic analysis fails
-                
-                # Try AI analysis if available (enhances the recommendations)
-                if ai_agent:
-                    try:
-                        logger.info("Attempting AI-enhanced analysis...")
-                        # Fetch additional resources for comprehensive analysis
-                        sql_warehouses = databricks_client.get_sql_warehouses()
-                        pools = databricks_client.get_instance_pools()
-                        vector_search = databricks_client.get_vector_search_endpoints()
-                        policies = databricks_client.get_cluster_policies()
-                        apps = databricks_client.get_apps()
-                        lakebase = databricks_client.get_lakebase_provisioned()
-                        ml_jobs = databricks_client.get_ml_jobs()
-                        mlflow_experiments = databricks_client.get_mlflow_experiments()
-                        mlflow_models = databricks_client.get_mlflow_models()
-                        model_serving = databricks_client.get_model_serving_endpoints()
-                        feature_store = databricks_client.get_feature_store_tables()
-                        
-                        job_runs = {}
-                        for job in jobs[:10]:
-                            job_id = job.get("job_id")
-                            if job_id:
-                                try:
-                                    runs = databricks_client.get_job_runs(job_id=job_id, limit=10)
-                                    job_runs[job_id] = runs
-                                except Exception as run_error:
-                                    logger.warning(f"Could not fetch runs for job {job_id}: {str(run_error)}")
-                        
-                        # Try AI analysis - if it works, use it; otherwise keep rule-based
-                        try:
-                            ai_recommendations = ai_agent.analyze_all_compute(
-                                jobs=jobs,
-                                clusters=clusters,
-                                sql_warehouses=sql_warehouses,
-                                pools=pools,
-                                vector_search=vector_search,
-                                policies=policies,
-                                apps=apps,
-                                lakebase=lakebase,
-                                ml_jobs=ml_jobs,
-                                mlflow_experiments=mlflow_experiments,
-                                mlflow_models=mlflow_models,
-                                model_serving=model_serving,
-                                feature_store=feature_store,
-                                job_runs=job_runs
-                            )
-                            # If AI analysis succeeds, use it (it's more comprehensive)
-                            if ai_recommendations and len(ai_recommendations) > 0:
-                                recommendations = ai_recommendations
-                                analysis_type = "ai"
-                                logger.info(f"AI analysis completed: {len(recommendations)} recommendations")
-                            else:
-                                logger.info("AI analysis returned no recommendations, using rule-based results")
-                        except Exception as ai_error:
-                            logger.warning(f"AI analysis failed, falling back to rule-based: {str(ai_error)}")
-                            # Fall through to rule-based analysis
-                            recommendations = []
-                    else:
-                        logger.info("AI agent not available, using rule-based analysis")
-                    
-                    # Ensure we have recommendations from rule-based analysis
-                    if not recommendations:
-                        recommendations = perform_basic_analysis(jobs, clusters)
-                        logger.info(f"Rule-based analysis completed: {len(recommendations)} recommendations")
-                    
-                    # If AI was attempted but failed, we already have rule-based recommendations
-                    # If AI was not available, we already have rule-based recommendations
-                    
-                    # Try to add analysis for other compute types if we can fetch them
+                if leader:
                     try:
-                        sql_warehouses = databricks_client.get_sql_warehouses()
-                        for warehouse in sql_warehouses:
-                            if warehouse.get("state") == "RUNNING":
-                                recommendations.append({
-                                    "id": f"rec_warehouse_{len(recommendations)}",
-                                    "type": "cost_leak",
-                                    "severity": "medium",
-                                    "title": f"Running SQL Warehouse: {warehouse.get('name', 'Unknown')}",
-                                    "description": "SQL warehouse is running. Monitor usage and consider auto-stop if idle.",
-                                    "resource_type": "sql_warehouse",
-                                    "resource_id": warehouse.get("id"),
-                                    "estimated_savings": "Medium",
-                                    "risk": "Low",
-                                })
-                        for pool in pools:
-                            if pool.get("status", {}).get("instance_use_count", 0) == 0:
-                                recommendations.append({
-                                    "id": f"rec_pool_{len(recommendations)}",
-                                    "type": "cost_leak",
-                                    "severity": "low",
-                                    "title": f"Unused Instance Pool: {pool.get('instance_pool_name', 'Unknown')}",
-                                    "description": "Instance pool has no active instances. Consider reviewing pool configuration.",
-                                    "resource_type": "pool",
-                                    "resource_id": pool.get("instance_pool_id"),
-                                    "estimated_savings": "Low",
-                                    "risk": "Low",
-                                })
-                        logger.info(f"Rule-based analysis completed: {len(recommendations)} recommendations")
-                        
-                except Exception as analysis_error:
-                    logger.error(f"Error during analysis: {str(analysis_error)}", exc_info=True)
-                    # Return at least a basic analysis result
-                    recommendations = perform_basic_analysis(jobs, clusters) if jobs or clusters else []
-                    if not recommendations:
-                        recommendations = [{
-                            "id": "rec_error",
-                            "type": "info",
-                            "severity": "low",
-                            "title": "Analysis Complete",
-                            "description": f"Analyzed {len(jobs)} jobs and {len(clusters)} clusters. Some analysis features may be limited.",
-                            "estimated_savings": "Continue monitoring",
-                            "risk": "None",
-                        }]
+                        future.set_result(_run_analysis(databricks_client))
+                    except Exception as e:
+                        logger.error("Error in analysis: %s", e, exc_info=True)
+                        future.set_exception(e)
+                    finally:
+                        with _analysis_inflight_lock:
+                            _analysis_inflight = None
+                else:
+                    logger.info("Analysis already in progress, waiting for its result")
                 
-                # Initialize variables for cache (set to empty if not fetched)
-                sql_warehouses = sql_warehouses if 'sql_warehouses' in locals() else []
-                pools = pools if 'pools' in locals() else []
-                vector_search = vector_search if 'vector_search' in locals() else []
-                policies = policies if 'policies' in locals() else []
-                apps = apps if 'apps' in locals() else []
-                lakebase = lakebase if 'lakebase' in locals() else []
-                ml_jobs = ml_jobs if 'ml_jobs' in locals() else []
-                mlflow_experiments = mlflow_experiments if 'mlflow_experiments' in locals() else []
-                mlflow_models = mlflow_models if 'mlflow_models' in locals() else []
-                model_serving = model_serving if 'model_serving' in locals() else []
-                feature_store = feature_store if 'feature_store' in locals() else []
-                
-                global analysis_cache, cache_timestamp
-                analysis_cache = {
-                    "recommendations": recommendations,
-                    "jobs_count": len(jobs),
-                    "clusters_count": len(clusters),
-                    "sql_warehouses_count": len(sql_warehouses),
-                    "pools_count": len(pools),
-                    "vector_search_count": len(vector_search),
-                    "policies_count": len(policies),
-                    "apps_count": len(apps),
-                    "lakebase_count": len(lakebase),
-                    "ml_jobs_count": len(ml_jobs),
-                    "mlflow_experiments_count": len(mlflow_experiments),
-                    "mlflow_models_count": len(mlflow_models),
-                    "model_serving_count": len(model_serving),
-                    "feature_store_count": len(feature_store),
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "analysis_type": analysis_type
-                }
-                cache_timestamp = datetime.utcnow()
-                
-                self._send_json_response({
-                    "recommendations": recommendations,
-                    "summary": {
-                        "total_jobs": len(jobs),
-                        "total_clusters": len(clusters),
-                        "sql_warehouses": len(sql_warehouses),
-                        "pools": len(pools),
-                        "vector_search_endpoints": len(vector_search),
-                        "policies": len(policies),
-                        "apps": len(apps),
-                        "lakebase_resources": len(lakebase),
-                        "ml_jobs": len(ml_jobs),
-                        "mlflow_experiments": len(mlflow_experiments),
-                        "mlflow_models": len(mlflow_models),
-                        "model_serving_endpoints": len(model_serving),
-                        "feature_store_tables": len(feature_store),
-                        "recommendations_count": len(recommendations),
-                        "timestamp": cache_timestamp.isoformat(),
-                        "analysis_type": analysis_type,
-                        "ai_available": ai_agent is not None
-                    }
-                })
+                try:
+                    payload = future.result()
+                except Exception as e:
+                    self._send_json_response({"error": str(e)}, 500)
+                    return
+                self._send_json_response(payload)
             
             else:
-                self._send_json_response({"error": "Not found"}, 404)
+                self._send_json_body(_NOT_FOUND_BODY, 404)
         
         except Exception as e:
-            logger.error(f"Error handling POST: {str(e)}", exc_info=True)
+            logger.error("Error handling POST: %s", e, exc_info=True)
             self._send_json_response({"error": str(e)}, 500)
     
     def log_message(self, format, *args):
         """Override to use our logger."""
-        logger.info(f"{self.address_string()} - {format % args}")
+        logger.info("%s - %s", self.address_string(), format % args)
 
 
 def run_server():
-    """Run the HTTP server."""
+    """Run the HTTP server, handling each request on its own thread."""
     port = settings.backend_port
     server_address = ('0.0.0.0', port)
-    httpd = HTTPServer(server_address, APIHandler)
-    logger.info(f"ClusterIQ Server starting on http://0.0.0.0:{port}")
-    logger.info(f"Using direct HTTP requests to Databricks API")
+    httpd = ThreadingHTTPServer(server_address, APIHandler)
+    logger.info("ClusterIQ Server starting on http://0.0.0.0:%s", port)
+    logger.info("Using direct HTTP requests to Databricks API")
     httpd.serve_forever()
 
 
@@ -0,0 +1,182 @@
+"""Offline tests for ClusterIQAgent's jobs-and-clusters analysis, on fake chat models."""
+import asyncio
+
+import orjson
+import pytest
+from langchain_core.messages import AIMessage
+
+from ai_agent import ClusterIQAgent, _JsonObjectScanner
+
+
+class _FakeLLM:
+    """Chat model stand-in answering with one finding per cluster in the prompt.
+    
+    With ``workspace_finding`` set, every answer also holds a finding that is
+    not tied to any resource.
+    """
+    
+    def __init__(self, workspace_finding=False):
+        self.workspace_finding = workspace_finding
+        self.prompted_clusters = []
+    
+    def batch(self, inputs, return_exceptions=False):
+        return [self._answer(messages) for messages in inputs]
+    
+    def _answer(self, messages):
+        context = orjson.loads(messages[-1].content)
+        cluster_ids = [cluster["i"] for cluster in context["clusters"]]
+        self.prompted_clusters.append(cluster_ids)
+        recommendations = [
+            {"t": "cost_leak", "s": "medium", "ti": f"Idle cluster {cluster_id}", "ri": cluster_id}
+            for cluster_id in cluster_ids
+        ]
+        if self.workspace_finding:
+            recommendations.append({"t": "optimization", "s": "low", "ti": "Adopt cluster policies"})
+        return orjson.dumps(recommendations).decode()
+
+
+def _clusters(workers):
+    return [
+        {"cluster_id": f"c{index}", "cluster_name": f"Cluster {index}", "state": "RUNNING", "num_workers": count}
+        for index, count in enumerate(workers)
+    ]
+
+
+@pytest.fixture
+def agent():
+    """Agent without response caching, so every analysis reaches the LLM."""
+    return ClusterIQAgent(api_key="test-key", response_cache_size=0)
+
+
+def test_incremental_analysis_only_prompts_changed_clusters(agent):
+    """A poll with one changed cluster prompts for it alone and keeps the rest."""
+    agent.llm = llm = _FakeLLM()
+    
+    first = agent.analyze_jobs_and_clusters([], _clusters([2, 2, 2, 2]))
+    second = agent.analyze_jobs_and_clusters([], _clusters([2, 2, 2, 3]))
+    
+    assert llm.prompted_clusters == [["c0", "c1", "c2", "c3"], ["c3"]]
+    assert sorted(rec["id"] for rec in second) == sorted(rec["id"] for rec in first)
+
+
+def test_incremental_analysis_does_not_duplicate_workspace_findings(agent):
+    """Findings without a resource id are regenerated, never carried over twice."""
+    agent.llm = llm = _FakeLLM(workspace_finding=True)
+    
+    for workers in ([2, 2, 2, 2], [2, 2, 2, 3], [2, 2, 2, 4], [2, 2, 2, 5]):
+        recommendations = agent.analyze_jobs_and_clusters([], _clusters(workers))
+        ids = [rec["id"] for rec in recommendations]
+        
+        assert len(recommendations) == 5
+        assert len(ids) == len(set(ids))
+    # Workspace-wide findings need the full context
+    assert all(len(cluster_ids) == 4 for cluster_ids in llm.prompted_clusters)
+
+
+class _TruncatingLLM:
+    """Chat model stand-in whose replies stop at the output token limit."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def batch(self, inputs, return_exceptions=False):
+        self.calls += len(inputs)
+        return [
+            AIMessage(content='[{"t": "cost_leak", "s": "med', response_metadata={"finish_reason": "length"})
+            for _ in inputs
+        ]
+
+
+def test_truncated_reply_is_not_cached():
+    """A cut-off reply falls back to rule-based analysis and is asked for again."""
+    agent = ClusterIQAgent(api_key="test-key")
+    agent.llm = llm = _TruncatingLLM()
+    clusters = _clusters([2, 2])
+    
+    for _ in range(2):
+        recommendations = agent.analyze_jobs_and_clusters([], clusters)
+        
+        assert [rec["resource_id"] for rec in recommendations] == ["c0", "c1"]
+    assert llm.calls == 2
+
+
+class _FailingLLM:
+    """Chat model stand-in whose streamed calls fail."""
+    
+    async def astream(self, messages):
+        raise RuntimeError("provider unavailable")
+        yield
+
+
+def test_stream_fallback_is_enhanced_and_reported(agent):
+    """A failed stream yields enhanced rule-based records and says so."""
+    agent.llm = _FailingLLM()
+    outcome = {}
+    
+    async def collect():
+        stream = agent.astream_jobs_and_clusters([], _clusters([2, 2]), outcome=outcome)
+        return [rec async for rec in stream]
+    
+    recommendations = asyncio.run(collect())
+    
+    assert outcome == {"analysis_type": "rule-based"}
+    assert [rec["resource_id"] for rec in recommendations] == ["c0", "c1"]
+    assert all(rec["id"].startswith("rec_") and rec["id"] != "rec_0" for rec in recommendations)
+    assert all("timestamp" in rec for rec in recommendations)
+
+
+def test_recommendation_ids_are_stable_and_unique(agent):
+    """Fallback ids derive from content, and colliding findings keep distinct ids."""
+    clusters = _clusters([2, 2])
+    
+    first = agent._fallback_analysis([], clusters)
+    second = agent._fallback_analysis([], list(reversed(clusters)))
+    
+    assert {rec["id"] for rec in first} == {rec["id"] for rec in second}
+    
+    twins = [
+        {"type": "cost_leak", "title": "Idle cluster", "resource_id": "c0", "description": description}
+        for description in ("No activity", "No activity", "Low utilization")
+    ]
+    enhanced = agent._enhance_recommendations(twins, [], clusters)
+    
+    assert len({rec["id"] for rec in enhanced}) == 3
+
+
+# Records with braces and brackets inside strings, escaped quotes and
+# backslashes, and nested objects and arrays
+_SCANNER_RECORDS = [
+    {"t": "cost_leak", "ti": 'Cluster "etl {prod}"', "d": "Ends with a backslash \\"},
+    {"t": "optimization", "cc": {"w": 4, "tags": {"team": "[data]"}}, "st": ["a}", "{b"]},
+    {"t": "info", "d": "Quote \\\" then brace }"},
+]
+
+
+def _scan(chunks):
+    scanner = _JsonObjectScanner()
+    return [record for chunk in chunks for record in scanner.feed(chunk)]
+
+
+def test_scanner_handles_every_chunk_boundary():
+    """Splitting the stream at any character yields the same records."""
+    text = "```json\n" + orjson.dumps(_SCANNER_RECORDS).decode() + "\n```"
+    
+    for split in range(1, len(text)):
+        assert _scan([text[:split], text[split:]]) == _SCANNER_RECORDS, split
+    assert _scan(list(text)) == _SCANNER_RECORDS
+
+
+def test_scanner_emits_each_record_when_it_closes():
+    """A record is returned by the feed that delivers its closing brace."""
+    first, second = (orjson.dumps(record).decode() for record in _SCANNER_RECORDS[:2])
+    scanner = _JsonObjectScanner()
+    
+    assert scanner.feed("[" + first[:-1]) == []
+    assert scanner.feed("}, " + second[:5]) == [_SCANNER_RECORDS[0]]
+    assert scanner.feed(second[5:] + "]") == [_SCANNER_RECORDS[1]]
+    assert scanner.emitted == 2
+
+
+def test_scanner_skips_malformed_records():
+    """An element that is not valid JSON is dropped; later ones still arrive."""
+    assert _scan(['[{"t": tru', 'e-ish}, {"t": "ok"}]']) == [{"t": "ok"}]
@@ -0,0 +1,42 @@
+"""Tests for Accept-Encoding negotiation."""
+import pytest
+
+import compression
+from compression import choose_encoding
+
+_LARGE = 4096
+
+
+@pytest.fixture
+def with_brotli(monkeypatch):
+    """Negotiate as if the optional brotli package were installed."""
+    monkeypatch.setattr(compression, "brotli", object())
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, deflate, br", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("gzip;q=0, br;q=0", None),
+    ("br;q=0.5, gzip;q=0.8", "gzip"),
+    ("*", "br"),
+    ("gzip;q=0, *;q=0.1", "br"),
+    ("BR", "br"),
+    ("identity", None),
+    ("", None),
+])
+def test_choose_encoding_honors_q_values(with_brotli, header, expected):
+    """Codings with q=0 are refused and the highest q wins, br on a tie."""
+    assert choose_encoding(header, _LARGE) == expected
+
+
+def test_choose_encoding_without_brotli(monkeypatch):
+    """Without brotli installed only gzip is offered."""
+    monkeypatch.setattr(compression, "brotli", None)
+    
+    assert choose_encoding("br, gzip", _LARGE) == "gzip"
+    assert choose_encoding("br", _LARGE) is None
+
+
+def test_small_bodies_are_not_compressed(with_brotli):
+    """Bodies under the size threshold are sent as is."""
+    assert choose_encoding("br, gzip", 100) is None
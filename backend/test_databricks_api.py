@@ -1,14 +1,200 @@
 """Test script to verify Databricks API connection."""
+import asyncio
+import hashlib
+import importlib.util
 import os
-from dotenv import load_dotenv
-import requests
+import time
+from pathlib import Path
+import orjson
+from dotenv import dotenv_values, find_dotenv
 
-load_dotenv()
+# Both probes share one connection as HTTP/2 streams when the optional h2
+# package is installed
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Connection setup fails fast; the list calls themselves get longer to answer
+_CONNECT_TIMEOUT = 3.05
+_PROBE_READ_TIMEOUT = 7
+# Cheap authenticated call that opens the pooled connection before the probes
+_WARMUP_PATH = "/api/2.0/preview/scim/v2/Me"
+_WARMUP_READ_TIMEOUT = 2
+
+# Same policy as DatabricksClient's session: transient errors and throttling
+# are retried on the pooled connection with exponential backoff
+_RETRY_TOTAL = 3
+_RETRY_BACKOFF = 0.3
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Successful probe reports are reused for this many seconds across runs when
+# CLUSTERIQ_PROBE_CACHE=1, so dev loops skip the control plane round trips
+_PROBE_CACHE_PATH = Path.home() / ".cache" / "clusteriq" / "databricks_probe.json"
+_PROBE_CACHE_TTL = 60
+
+# (name, path, items key, query params) per probed list API. A one-item page is
+# enough to prove access; counting a whole workspace would transfer every job
+# and cluster.
+_PROBES = (
+    ("Jobs", "/api/2.1/jobs/list", "jobs", {"limit": 1, "expand_tasks": "false"}),
+    ("Clusters", "/api/2.1/clusters/list", "clusters", {"page_size": 1}),
+)
+
+# Variables read so far; .env is parsed at most once per process
+_env_cache = {}
+_dotenv_values = None
+
+def _read_env(name):
+    """Return an environment variable, falling back to .env only if unset.
+    
+    Args:
+        name: Variable name
+    
+    Returns:
+        The variable's value, or "" if it is set in neither place
+    """
+    global _dotenv_values
+    if name not in _env_cache:
+        value = os.environ.get(name)
+        if value is None:
+            if _dotenv_values is None:
+                _dotenv_values = dotenv_values(find_dotenv())
+            value = _dotenv_values.get(name) or ""
+        _env_cache[name] = value
+    return _env_cache[name]
+
+def _load_probe_cache():
+    """Read the on-disk probe cache, or an empty one if missing or unreadable."""
+    try:
+        return orjson.loads(_PROBE_CACHE_PATH.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+def _save_probe_cache(cache):
+    """Write the probe cache, ignoring filesystem errors."""
+    try:
+        _PROBE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _PROBE_CACHE_PATH.write_bytes(orjson.dumps(cache))
+    except OSError:
+        pass
+
+def _report(name, url, items_key, response):
+    """Describe the outcome of a list API call.
+    
+    Args:
+        name: API name for the report
+        url: List endpoint that was called
+        items_key: Response key holding the listed items
+        response: The call's response, or the exception it raised
+    
+    Returns:
+        Report lines
+    """
+    lines = [f"Calling: {url}"]
+    if isinstance(response, Exception):
+        lines.append(f"✗ {name} API: ERROR")
+        lines.append(f"  {str(response)}")
+    elif response.status_code == 200:
+        data = orjson.loads(response.content)
+        lines.append(f"✓ {name} API: SUCCESS")
+        count = len(data.get(items_key, []))
+        # Jobs pages report has_more, cluster pages a next_page_token
+        more = "+" if data.get("has_more") or data.get("next_page_token") else ""
+        lines.append(f"  Found {count}{more} {items_key}")
+    else:
+        lines.append(f"✗ {name} API: FAILED")
+        lines.append(f"  Status Code: {response.status_code}")
+        # Decode only the printed prefix rather than a possibly large error page
+        lines.append(f"  Response: {response.content[:200].decode('utf-8', errors='replace')}")
+    return lines
+
+async def _get_with_retry(client, path, params):
+    """GET a probe path, retrying transient failures.
+    
+    Args:
+        client: httpx.AsyncClient to call through
+        path: API path relative to the client's base URL
+        params: Query parameters
+    
+    Returns:
+        The last response; the last transport error is raised instead if every
+        attempt failed to get one
+    """
+    import httpx
+    
+    for attempt in range(_RETRY_TOTAL + 1):
+        try:
+            response = await client.get(path, params=params)
+        except httpx.TransportError:
+            if attempt == _RETRY_TOTAL:
+                raise
+            delay = _RETRY_BACKOFF * 2 ** attempt
+        else:
+            if response.status_code not in _RETRY_STATUSES or attempt == _RETRY_TOTAL:
+                return response
+            # Throttled responses wait as long as the API asks
+            retry_after = response.headers.get("Retry-After", "")
+            delay = float(retry_after) if retry_after.isdigit() else _RETRY_BACKOFF * 2 ** attempt
+        await asyncio.sleep(delay)
+
+async def _probe_all(host, token):
+    """Call the Jobs and Clusters list APIs concurrently and print the results.
+    
+    With CLUSTERIQ_PROBE_CACHE=1, successful reports younger than
+    _PROBE_CACHE_TTL are printed from the on-disk cache instead of calling
+    the API again.
+    """
+    # Imported here so a missing configuration is reported without paying
+    # for httpx's import
+    import httpx
+    
+    use_cache = _read_env("CLUSTERIQ_PROBE_CACHE") == "1"
+    cache = _load_probe_cache() if use_cache else {}
+    # Entries are per workspace and credential; the token itself is not stored
+    key_prefix = hashlib.sha256(f"{host}{token}".encode()).hexdigest()[:16]
+    now = time.time()
+    
+    reports = {}
+    for _, path, _, _ in _PROBES:
+        entry = cache.get(f"{key_prefix}:{path}")
+        if entry and now - entry["ts"] < _PROBE_CACHE_TTL:
+            reports[path] = entry["lines"]
+    pending = [probe for probe in _PROBES if probe[1] not in reports]
+    
+    if pending:
+        async with httpx.AsyncClient(
+            base_url=host,
+            headers={"Authorization": f"Bearer {token}"},
+            http2=_HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(_PROBE_READ_TIMEOUT, connect=_CONNECT_TIMEOUT),
+        ) as client:
+            if len(pending) > 1:
+                # Failures here are reported by the probes themselves
+                try:
+                    await client.get(_WARMUP_PATH, timeout=httpx.Timeout(_WARMUP_READ_TIMEOUT, connect=_CONNECT_TIMEOUT))
+                except httpx.HTTPError:
+                    pass
+            responses = await asyncio.gather(
+                *(_get_with_retry(client, path, params) for _, path, _, params in pending),
+                return_exceptions=True
+            )
+        for (name, path, items_key, _), response in zip(pending, responses):
+            reports[path] = _report(name, f"{host}{path}", items_key, response)
+            # Only successes are cached so a fixed failure shows up on the next run
+            if use_cache and not isinstance(response, Exception) and response.status_code == 200:
+                cache[f"{key_prefix}:{path}"] = {"ts": now, "lines": reports[path]}
+        if use_cache:
+            _save_probe_cache(cache)
+    
+    # Reported in probe order so the output reads the same every run
+    for index, (_, path, _, _) in enumerate(_PROBES):
+        if index:
+            print()
+        for line in reports[path]:
+            print(line)
 
 def test_databricks_api():
     """Test Databricks API connection."""
-    host = os.getenv("DATABRICKS_HOST", "").rstrip('/')
-    token = os.getenv("DATABRICKS_TOKEN", "")
+    host = _read_env("DATABRICKS_HOST").rstrip('/')
+    token = _read_env("DATABRICKS_TOKEN")
     
     if not host or not token:
         print("ERROR: DATABRICKS_HOST and DATABRICKS_TOKEN must be set in .env")
@@ -18,56 +204,7 @@ def test_databricks_api():
     print(f"Token: {'*' * 20}...{token[-4:] if len(token) > 4 else '****'}")
     print()
     
-    # Test Jobs API
-    try:
-        url = f"{host}/api/2.1/jobs/list"
-        headers = {
-            "Authorization": f"Bearer {token}"
-        }
-        
-        print(f"Calling: {url}")
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            job_count = len(data.get("jobs", []))
-            print(f"✓ Jobs API: SUCCESS")
-            print(f"  Found {job_count} jobs")
-        else:
-            print(f"✗ Jobs API: FAILED")
-            print(f"  Status Code: {response.status_code}")
-            print(f"  Response: {response.text[:200]}")
-    
-    except Exception as e:
-        print(f"✗ Jobs API: ERROR")
-        print(f"  {str(e)}")
-    
-    print()
-    
-    # Test Clusters API
-    try:
-        url = f"{host}/api/2.1/clusters/list"
-        headers = {
-            "Authorization": f"Bearer {token}"
-        }
-        
-        print(f"Calling: {url}")
-        response = requests.get(url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
-            cluster_count = len(data.get("clusters", []))
-            print(f"✓ Clusters API: SUCCESS")
-            print(f"  Found {cluster_count} clusters")
-        else:
-            print(f"✗ Clusters API: FAILED")
-            print(f"  Status Code: {response.status_code}")
-            print(f"  Response: {response.text[:200]}")
-    
-    except Exception as e:
-        print(f"✗ Clusters API: ERROR")
-        print(f"  {str(e)}")
+    asyncio.run(_probe_all(host, token))
 
 if __name__ == "__main__":
     test_databricks_api()
-
@@ -0,0 +1,129 @@
+"""Offline tests for DatabricksClient's response cache and pagination."""
+import threading
+import time
+
+import orjson
+import pytest
+import requests
+
+import databricks_client
+from databricks_client import DatabricksClient
+
+
+def _response(status_code=200, body=None, etag=None):
+    """Build a requests.Response with a JSON body."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = orjson.dumps(body) if body is not None else b""
+    if etag:
+        response.headers["ETag"] = etag
+    return response
+
+
+class _FakeApi:
+    """Stand-in for DatabricksClient._request serving canned pages.
+    
+    Pages are keyed by page token (None for the first page); a request whose
+    If-None-Match matches ``etag`` is answered with a 304.
+    """
+    
+    def __init__(self, pages, etag=None, delay=0):
+        self.pages = pages
+        self.etag = etag
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+    
+    def __call__(self, method, path, params=None, headers=None):
+        with self._lock:
+            self.calls.append((path, dict(params or {}), headers))
+        time.sleep(self.delay)
+        if self.etag and headers and headers.get("If-None-Match") == self.etag:
+            return _response(304)
+        page = self.pages[(params or {}).get("page_token")]
+        return _response(body=page, etag=self.etag)
+
+
+def _items(body):
+    return body.get("items", [])
+
+
+@pytest.fixture
+def client():
+    """Client that never reaches the network; tests install a _FakeApi."""
+    client = DatabricksClient(host="https://example.cloud.databricks.com", token="token")
+    yield client
+    client.close()
+
+
+def test_fresh_hit_makes_no_request(client):
+    """A second call within the TTL is served from the cache."""
+    client._request = api = _FakeApi({None: {"items": [1, 2]}})
+    
+    first = client._cached_get("/api/list", _items)
+    second = client._cached_get("/api/list", _items)
+    
+    assert len(api.calls) == 1
+    assert second is first
+
+
+def test_not_modified_reuses_cached_entry(client):
+    """A stale entry is revalidated with its ETag and reused on a 304."""
+    client.cache_ttl = 0
+    client._request = api = _FakeApi({None: {"items": [1, 2]}}, etag='"v1"')
+    
+    first = client._cached_get("/api/list", _items)
+    second = client._cached_get("/api/list", _items)
+    
+    assert [headers for _, _, headers in api.calls] == [None, {"If-None-Match": '"v1"'}]
+    assert second is first
+
+
+def test_pages_are_joined_and_etag_dropped(client):
+    """Every page of a listing is fetched; the first page's ETag is not kept."""
+    client.cache_ttl = 0
+    client._request = api = _FakeApi(
+        {None: {"items": [1], "next_page_token": "p2"}, "p2": {"items": [2]}},
+        etag='"v1"',
+    )
+    
+    assert client._cached_get("/api/list", _items, items_key="items") == [1, 2]
+    assert [params.get("page_token") for _, params, _ in api.calls] == [None, "p2"]
+    
+    client._cached_get("/api/list", _items, items_key="items")
+    
+    # Not revalidated with the first page's ETag, which does not cover page two
+    assert api.calls[2][2] is None
+
+
+def test_pagination_stops_at_max_pages(client, monkeypatch):
+    """A listing that never ends is cut off after _MAX_PAGES requests."""
+    monkeypatch.setattr(databricks_client, "_MAX_PAGES", 3)
+    client._request = api = _FakeApi({
+        token: {"items": [index], "next_page_token": f"p{index + 1}"}
+        for index, token in enumerate([None, "p1", "p2", "p3", "p4"])
+    })
+    
+    assert client._cached_get("/api/list", _items, items_key="items") == [0, 1, 2]
+    assert len(api.calls) == 3
+
+
+def test_concurrent_misses_share_one_request(client):
+    """Callers missing the same key at once wait for a single fetch."""
+    client._request = api = _FakeApi({None: {"items": [1, 2]}}, delay=0.05)
+    barrier = threading.Barrier(8)
+    results = []
+    
+    def fetch():
+        barrier.wait()
+        results.append(client._cached_get("/api/list", _items))
+    
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(api.calls) == 1
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,44 @@
+"""Offline tests for the Flask API's HTTP caching."""
+import pytest
+
+import main
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Flask test client with a finished analysis in the cache."""
+    monkeypatch.setattr(main, "analysis_cache", {
+        "recommendations": [{"id": "rec_1", "title": "Idle cluster"}],
+        "jobs_count": 1,
+        "clusters_count": 1,
+        "timestamp": "2024-01-01T00:00:00+00:00",
+        "analysis_type": "rule-based",
+    })
+    return main.app.test_client()
+
+
+def test_recommendations_sent_with_etag(client):
+    """The cached analysis is returned with its timestamp as the ETag."""
+    response = client.get("/api/recommendations")
+    
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"2024-01-01T00:00:00+00:00"'
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert response.get_json()["recommendations"] == [{"id": "rec_1", "title": "Idle cluster"}]
+    assert response.get_json()["has_analysis"] is True
+
+
+def test_recommendations_not_modified(client):
+    """A matching If-None-Match gets an empty 304 until the analysis changes."""
+    etag = client.get("/api/recommendations").headers["ETag"]
+    
+    response = client.get("/api/recommendations", headers={"If-None-Match": etag})
+    
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+    
+    main.analysis_cache = {**main.analysis_cache, "timestamp": "2024-01-01T00:05:00+00:00"}
+    response = client.get("/api/recommendations", headers={"If-None-Match": etag})
+    
+    assert response.status_code == 200
@@ -64,6 +64,24 @@ export const analyzeJobsAndClusters = async () => {
   return response.data
 }
 
+// Stream AI recommendations over server-sent events as they are generated.
+// Returns a function that closes the stream.
+export const streamAnalysis = ({ onRecommendation, onDone, onError } = {}) => {
+  const source = new EventSource(`${API_BASE_URL}/api/analyze/stream`)
+  source.addEventListener('recommendation', (event) => {
+    onRecommendation?.(JSON.parse(event.data))
+  })
+  source.addEventListener('done', (event) => {
+    source.close()
+    onDone?.(JSON.parse(event.data))
+  })
+  source.addEventListener('error', (event) => {
+    source.close()
+    onError?.(event.data ? JSON.parse(event.data) : { error: 'Stream connection failed' })
+  })
+  return () => source.close()
+}
+
 export const fetchRecommendations = async () => {
   const response = await api.get('/api/recommendations')
   return response.data
@@ -7,5 +7,5 @@ if [ ! -d "venv" ]; then
 fi
 source venv/bin/activate
 pip install -r requirements.txt --quiet
-python main.py
+gunicorn main:app
 